@@ -10,13 +10,24 @@ setup(
     long_description_content_type='text/markdown',
     url='https://github.com/conallob/py-timeular',
     packages=find_packages(),
+    py_modules=['timeular', 'timeular_analytics', 'timeular_async', 'timeular_bench', 'timeular_bulk', 'timeular_cache', 'timeular_cli', 'timeular_feed', 'timeular_http', 'timeular_json', 'timeular_metrics', 'timeular_mockserver', 'timeular_models', 'timeular_pool', 'timeular_queue', 'timeular_reports', 'timeular_retry', 'timeular_singleflight', 'timeular_store', 'timeular_transport'],
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     install_requires=[
         'requests',  # Add other dependencies here
     ],
+    entry_points={
+        'console_scripts': ['timeular = timeular_cli:main'],
+    },
+    extras_require={
+        'analytics': ['numpy'],
+        'async': ['aiohttp'],
+        'fast-json': ['ijson', 'orjson'],
+        'parquet': ['pyarrow'],
+        'record': ['vcrpy'],
+    },
 )
@@ -1,82 +1,437 @@
-import requests
-from typing import Dict, Any
-import vcr
+import json
+import os
+import threading
+import time
+from contextlib import closing, contextmanager
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, Any, Callable, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+from timeular_bulk import BulkResult, run_bulk
+from timeular_cache import ResponseCache
+from timeular_json import iter_array_items, loads
+from timeular_metrics import Hook, Metrics, RequestEvent, run_hooks
+from timeular_models import MODELS_BY_KEY, TimeEntry, convert_payload, to_model
+from timeular_retry import RateLimiter, RetryPolicy
+from timeular_singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+BASE_URL = "https://api.timeular.com/api/v4"
+
+Timeout = Union[float, Tuple[float, float]]
+DateLike = Union[str, date]
+
+
+def to_date(value: DateLike) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def date_windows(start_date: DateLike, end_date: DateLike, window: timedelta) -> Iterator[Tuple[date, date]]:
+    """Split the inclusive range ``start_date``..``end_date`` into consecutive
+    inclusive windows of at most ``window`` days."""
+    if window < timedelta(days=1):
+        raise ValueError("window must be at least one day")
+    start, end = to_date(start_date), to_date(end_date)
+    while start <= end:
+        window_end = min(start + window - timedelta(days=1), end)
+        yield start, window_end
+        start = window_end + timedelta(days=1)
+
+
+class WindowMerger:
+    """Drops time entries that the previous window already produced.
+
+    Feed the windows in order to ``window`` and exhaust each iterator before
+    starting the next; an entry spanning several windows is yielded once.
+    Entries without an id are always yielded.
+    """
+
+    def __init__(self) -> None:
+        self._previous_ids: Set[str] = set()
+
+    def window(self, entries: Iterable[Any]) -> Iterator[Any]:
+        current_ids: Set[str] = set()
+        for data in entries:
+            entry_id = data.get("id") if isinstance(data, dict) else data.id
+            if entry_id is not None:
+                entry_id = str(entry_id)
+                current_ids.add(entry_id)
+                if entry_id in self._previous_ids:
+                    continue
+            yield data
+        self._previous_ids = current_ids
+
+
+def merge_windows(windows: Iterable[Iterable[Any]]) -> Iterator[Any]:
+    """Chain the time entries of consecutive windows, dropping entries that
+    the previous window already produced."""
+    merger = WindowMerger()
+    for entries in windows:
+        yield from merger.window(entries)
+
+
+class TokenCache:
+    """Access tokens persisted to a JSON file that several processes can share.
+
+    Entries are keyed by a hash of the API key, and read-modify-write cycles
+    hold an advisory lock on ``<path>.lock`` so that concurrent processes
+    sign in at most once per expired token.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.expanduser(path)
+
+    @staticmethod
+    def _key(api_key: str) -> str:
+        import hashlib
+
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _store(self, data: Dict[str, str]) -> None:
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".timeular-token-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, api_key: str) -> Optional[str]:
+        return self._load().get(self._key(api_key))
+
+    def set(self, api_key: str, token: str) -> None:
+        with self._locked():
+            data = self._load()
+            data[self._key(api_key)] = token
+            self._store(data)
+
+    def acquire(self, api_key: str, sign_in: Callable[[], str], stale: Optional[str] = None) -> str:
+        """Return the cached token, calling ``sign_in`` only if there is none
+        or the cached one is ``stale``."""
+        with self._locked():
+            data = self._load()
+            key = self._key(api_key)
+            token = data.get(key)
+            if token is not None and token != stale:
+                return token
+            token = sign_in()
+            data[key] = token
+            self._store(data)
+            return token
+
 
 class TimeularClient:
-    def __init__(self, api_key: str, api_secret: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: Optional[Timeout] = (5.0, 30.0),
+        cassette: Optional[str] = None,
+        record_mode: Optional[str] = None,
+        token_cache: Optional[TokenCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        models: bool = False,
+        stream: bool = False,
+        metrics: Optional[Metrics] = None,
+        single_flight: bool = False,
+        session: Optional["requests.Session"] = None,
+        base_url: str = BASE_URL,
+    ) -> None:
         self.api_key = api_key
         self.api_secret = api_secret
-        self.base_url = "https://api.timeular.com/api/v4"
-        self.token = self._get_access_token()
+        self.base_url = base_url
+        self.token_cache = token_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        self.models = models
+        self.stream = stream
+        self.metrics = metrics
+        self.pre_request_hooks: List[Hook] = []
+        self.post_request_hooks: List[Hook] = [metrics] if metrics is not None else []
+        self.single_flight = SingleFlight() if single_flight else None
+        self._token: Optional[str] = None
+        self._token_lock = threading.Lock()
+        # ``session`` can be any object shaped like a requests.Session (see
+        # timeular_transport for an in-memory one); a session passed in is
+        # left open by close().
+        self._owns_session = session is None
+        self.session = session if session is not None else self._create_session(
+            pool_connections, pool_maxsize, pool_block, keep_alive, timeout
+        )
+        self._cassette: Any = None
+        cassette = cassette or os.environ.get("TIMEULAR_CASSETTE")
+        if cassette:
+            self._start_recording(cassette, record_mode or os.environ.get("TIMEULAR_RECORD_MODE", "once"))
+
+    @staticmethod
+    def _create_session(
+        pool_connections: int,
+        pool_maxsize: int,
+        pool_block: bool,
+        keep_alive: bool,
+        timeout: Optional[Timeout],
+    ) -> "requests.Session":
+        # requests is only imported once a client actually needs a session.
+        from timeular_http import create_session
+
+        return create_session(pool_connections, pool_maxsize, pool_block, keep_alive, timeout)
+
+    def _start_recording(self, path: str, record_mode: str) -> None:
+        # Record/replay is opt-in: vcrpy is only imported here, and the
+        # cassette stays open for the lifetime of the client instead of
+        # being loaded and saved around every call.
+        import vcr
+
+        self._cassette = vcr.use_cassette(path, record_mode=record_mode)
+        self._cassette.__enter__()
+
+    def close(self) -> None:
+        if self._cassette is not None:
+            cassette, self._cassette = self._cassette, None
+            cassette.__exit__(None, None, None)
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "TimeularClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
-    @vcr.use_cassette('cassettes/get_access_token.yaml')
     def _get_access_token(self) -> str:
         url = f"{self.base_url}/developer/sign-in"
-        response = requests.post(url, json={"apiKey": self.api_key, "apiSecret": self.api_secret})
+        response = self._observed(
+            "POST", "/developer/sign-in", 0,
+            lambda: self.session.post(url, json={"apiKey": self.api_key, "apiSecret": self.api_secret}),
+        )
         response.raise_for_status()
         return response.json()["token"]
 
-    @vcr.use_cassette('cassettes/request.yaml')
-    def _request(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+    @property
+    def token(self) -> str:
+        token = self._token
+        if token is None:
+            token = self._refresh_token(None)
+        return token
+
+    @token.setter
+    def token(self, token: Optional[str]) -> None:
+        self._token = token
+
+    def _refresh_token(self, stale: Optional[str]) -> str:
+        # Callers that saw a 401 pass the token that failed; whoever gets the
+        # lock first signs in and everyone else picks up the new token.
+        with self._token_lock:
+            if self._token is not None and self._token != stale:
+                return self._token
+            if self.token_cache is not None:
+                token = self.token_cache.acquire(self.api_key, self._get_access_token, stale)
+            else:
+                token = self._get_access_token()
+            self._token = token
+            return token
+
+    def _observed(
+        self, method: str, endpoint: str, attempt: int, send: Callable[[], "requests.Response"], stream: bool = False
+    ) -> "requests.Response":
+        if not self.pre_request_hooks and not self.post_request_hooks:
+            return send()
+        event = RequestEvent(method, endpoint, attempt)
+        run_hooks(self.pre_request_hooks, event)
+        started = time.perf_counter()
+        try:
+            response = send()
+        except Exception as exc:
+            event.error = exc
+            raise
+        else:
+            event.status = response.status_code
+            body = response.request.body if response.request is not None else None
+            event.request_bytes = len(body) if isinstance(body, (bytes, str)) else 0
+            if stream:
+                # Reading the body here would defeat streaming; fall back to
+                # the advertised length.
+                length = response.headers.get("Content-Length")
+                event.response_bytes = int(length) if length and length.isdigit() else None
+            else:
+                event.response_bytes = len(response.content)
+            return response
+        finally:
+            event.elapsed = time.perf_counter() - started
+            run_hooks(self.post_request_hooks, event)
+
+    def _send(
+        self, method: str, endpoint: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any
+    ) -> "requests.Response":
         url = f"{self.base_url}{endpoint}"
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = requests.request(method, url, headers=headers, **kwargs)
+        token = self.token
+        refreshed = False
+        attempt = 0
+        self.retry_policy.record_request()
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            request_headers = {"Authorization": f"Bearer {token}"}
+            if headers:
+                request_headers.update(headers)
+            response = self._observed(
+                method, endpoint, attempt,
+                lambda: self.session.request(method, url, headers=request_headers, **kwargs),
+                kwargs.get("stream", False),
+            )
+            if response.status_code == 401 and not refreshed:
+                token = self._refresh_token(token)
+                refreshed = True
+                continue
+            delay = self.retry_policy.retry_delay(method, response.status_code, response.headers, attempt)
+            if delay is None:
+                break
+            if self.rate_limiter is not None and response.status_code in self.retry_policy.statuses:
+                self.rate_limiter.pause(delay)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
         response.raise_for_status()
-        return response.json()
+        return response
+
+    def _request(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+        payload = self._fetch(method, endpoint, **kwargs)
+        return convert_payload(payload) if self.models else payload
+
+    def _fetch(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+        cache = self.cache
+        if method != "GET":
+            try:
+                return self._send(method, endpoint, **kwargs).json()
+            finally:
+                if cache is not None:
+                    cache.invalidate(endpoint)
+                if self.single_flight is not None:
+                    self.single_flight.forget()
+        if kwargs:
+            return self._send(method, endpoint, **kwargs).json()
+        if self.single_flight is not None:
+            # Concurrent callers share the body and decode their own copy.
+            return loads(self.single_flight.do(endpoint, lambda: self._get_body(endpoint)))
+        if cache is None or cache.ttl_for(endpoint) is None:
+            return self._send(method, endpoint).json()
+        return loads(self._get_body(endpoint))
+
+    def _get_body(self, endpoint: str) -> bytes:
+        cache = self.cache
+        if cache is None or cache.ttl_for(endpoint) is None:
+            return self._send("GET", endpoint).content
+        body, etag, generation = cache.lookup(endpoint)
+        if body is not None:
+            return body
+        response = self._send("GET", endpoint, headers={"If-None-Match": etag} if etag else None)
+        if response.status_code == 304:
+            body = cache.revalidate(endpoint)
+            if body is None:
+                response = self._send("GET", endpoint)
+        if body is None:
+            body = response.content
+            cache.store(endpoint, body, response.headers.get("ETag"), generation)
+        return body
+
+    def _conditional_request(
+        self, method: str, endpoint: str, etag: Optional[str] = None, **kwargs: Any
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """Send with If-None-Match when ``etag`` is given; the body is None when the server answers 304."""
+        response = self._send(method, endpoint, headers={"If-None-Match": etag} if etag else None, **kwargs)
+        if response.status_code == 304:
+            return None, etag
+        return response.content, response.headers.get("ETag")
+
+    def _stream_items(self, method: str, endpoint: str, key: str, **kwargs: Any) -> Iterator[Any]:
+        # Decodes the array at ``key`` item by item while the body is still
+        # arriving instead of buffering and decoding the whole document.
+        model = MODELS_BY_KEY.get(key) if self.models else None
+        response = self._send(method, endpoint, stream=True, **kwargs)
+        with closing(response):
+            for item in iter_array_items(response.iter_content(chunk_size=64 * 1024), key):
+                yield to_model(model, item) if model is not None else item
 
-    @vcr.use_cassette('cassettes/get_activities.yaml')
     def get_activities(self) -> Dict[str, Any]:
         return self._request("GET", "/activities")
 
-    @vcr.use_cassette('cassettes/create_activity.yaml')
     def create_activity(self, name: str, color: str) -> Dict[str, Any]:
         data = {"name": name, "color": color}
         return self._request("POST", "/activities", json=data)
 
-    @vcr.use_cassette('cassettes/edit_activity.yaml')
     def edit_activity(self, activity_id: str, name: str, color: str) -> Dict[str, Any]:
         data = {"name": name, "color": color}
         return self._request("PATCH", f"/activities/{activity_id}", json=data)
 
-    @vcr.use_cassette('cassettes/archive_activity.yaml')
     def archive_activity(self, activity_id: str) -> Dict[str, Any]:
         return self._request("DELETE", f"/activities/{activity_id}")
 
-    @vcr.use_cassette('cassettes/get_time_entries.yaml')
     def get_time_entries(self) -> Dict[str, Any]:
         return self._request("GET", "/time-entries")
 
-    @vcr.use_cassette('cassettes/stop_current_activity.yaml')
     def stop_current_activity(self) -> Dict[str, Any]:
         return self._request("DELETE", "/tracking")
 
-    @vcr.use_cassette('cassettes/get_current_tracking.yaml')
     def get_current_tracking(self) -> Dict[str, Any]:
         return self._request("GET", "/tracking")
 
-    @vcr.use_cassette('cassettes/start_tracking.yaml')
     def start_tracking(self, activity_id: str) -> Dict[str, Any]:
         data = {"activityId": activity_id}
         return self._request("POST", "/tracking", json=data)
 
-    @vcr.use_cassette('cassettes/edit_tracking.yaml')
     def edit_tracking(self, tracking_id: str, started_at: str, stopped_at: str) -> Dict[str, Any]:
         data = {"startedAt": started_at, "stoppedAt": stopped_at}
         return self._request("PATCH", f"/tracking/{tracking_id}", json=data)
 
-    @vcr.use_cassette('cassettes/remove_tracking.yaml')
     def remove_tracking(self, tracking_id: str) -> Dict[str, Any]:
         return self._request("DELETE", f"/tracking/{tracking_id}")
 
-    @vcr.use_cassette('cassettes/cancel_tracking.yaml')
     def cancel_tracking(self) -> Dict[str, Any]:
         return self._request("DELETE", "/tracking")
 
-    @vcr.use_cassette('cassettes/find_time_entry.yaml')
     def find_time_entry(self, time_entry_id: str) -> Dict[str, Any]:
         return self._request("GET", f"/time-entries/{time_entry_id}")
 
-    @vcr.use_cassette('cassettes/create_time_entry.yaml')
     def create_time_entry(self, activity_id: str, started_at: str, stopped_at: str) -> Dict[str, Any]:
         data = {
             "activityId": activity_id,
@@ -85,7 +440,6 @@ class TimeularClient:
         }
         return self._request("POST", "/time-entries", json=data)
 
-    @vcr.use_cassette('cassettes/edit_time_entry.yaml')
     def edit_time_entry(self, time_entry_id: str, started_at: str, stopped_at: str) -> Dict[str, Any]:
         data = {
             "startedAt": started_at,
@@ -93,11 +447,34 @@ class TimeularClient:
         }
         return self._request("PATCH", f"/time-entries/{time_entry_id}", json=data)
 
-    @vcr.use_cassette('cassettes/delete_time_entry.yaml')
     def delete_time_entry(self, time_entry_id: str) -> Dict[str, Any]:
         return self._request("DELETE", f"/time-entries/{time_entry_id}")
 
-    @vcr.use_cassette('cassettes/generate_report.yaml')
+    def stream_time_entries(self) -> Iterator[Any]:
+        """Like get_time_entries, but yields the entries one at a time as they are decoded."""
+        return self._stream_items("GET", "/time-entries", "timeEntries")
+
+    def bulk_create_time_entries(
+        self, entries: Iterable[Mapping[str, str]], max_workers: int = 8, ordered: bool = False
+    ) -> Iterator[BulkResult]:
+        """Create time entries concurrently, yielding a BulkResult per entry.
+
+        Each entry holds create_time_entry's keyword arguments. Keep
+        ``max_workers`` at or below the client's ``pool_maxsize`` so every
+        worker gets a pooled connection.
+        """
+        return run_bulk(lambda entry: self.create_time_entry(**entry), entries, max_workers, ordered)
+
+    def bulk_edit_time_entries(
+        self, entries: Iterable[Mapping[str, str]], max_workers: int = 8, ordered: bool = False
+    ) -> Iterator[BulkResult]:
+        return run_bulk(lambda entry: self.edit_time_entry(**entry), entries, max_workers, ordered)
+
+    def bulk_delete_time_entries(
+        self, time_entry_ids: Iterable[str], max_workers: int = 8, ordered: bool = False
+    ) -> Iterator[BulkResult]:
+        return run_bulk(self.delete_time_entry, time_entry_ids, max_workers, ordered)
+
     def generate_report(self, start_date: str, end_date: str) -> Dict[str, Any]:
         data = {
             "startDate": start_date,
@@ -105,38 +482,63 @@ class TimeularClient:
         }
         return self._request("POST", "/reports/time-entries", json=data)
 
-    @vcr.use_cassette('cassettes/get_tags.yaml')
+    def stream_report(self, start_date: str, end_date: str) -> Iterator[Any]:
+        """Like generate_report, but yields the report's time entries one at a time as they are decoded."""
+        data = {
+            "startDate": start_date,
+            "endDate": end_date
+        }
+        return self._stream_items("POST", "/reports/time-entries", "timeEntries", json=data)
+
+    def _report_entries(self, start_date: str, end_date: str) -> Iterable[Any]:
+        if self.stream:
+            return self.stream_report(start_date, end_date)
+        return self.generate_report(start_date, end_date).get("timeEntries") or ()
+
+    def iter_time_entries(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        window: timedelta = timedelta(days=30),
+    ) -> Iterator[TimeEntry]:
+        """Yield the time entries between two dates one report window at a time.
+
+        Only one window's response is held in memory, or only one entry at a
+        time when the client was created with ``stream=True``. Entries that
+        straddle a window boundary are reported by both windows and yielded
+        once.
+        """
+        reports = (
+            self._report_entries(window_start.isoformat(), window_end.isoformat())
+            for window_start, window_end in date_windows(start_date, end_date, window)
+        )
+        for data in merge_windows(reports):
+            yield to_model(TimeEntry, data)
+
     def get_tags(self) -> Dict[str, Any]:
         return self._request("GET", "/tags")
 
-    @vcr.use_cassette('cassettes/create_tag.yaml')
     def create_tag(self, label: str) -> Dict[str, Any]:
         data = {"label": label}
         return self._request("POST", "/tags", json=data)
 
-    @vcr.use_cassette('cassettes/edit_tag.yaml')
     def edit_tag(self, tag_id: str, label: str) -> Dict[str, Any]:
         data = {"label": label}
         return self._request("PATCH", f"/tags/{tag_id}", json=data)
 
-    @vcr.use_cassette('cassettes/delete_tag.yaml')
     def delete_tag(self, tag_id: str) -> Dict[str, Any]:
         return self._request("DELETE", f"/tags/{tag_id}")
 
-    @vcr.use_cassette('cassettes/get_mentions.yaml')
     def get_mentions(self) -> Dict[str, Any]:
         return self._request("GET", "/mentions")
 
-    @vcr.use_cassette('cassettes/create_mention.yaml')
     def create_mention(self, label: str) -> Dict[str, Any]:
         data = {"label": label}
         return self._request("POST", "/mentions", json=data)
 
-    @vcr.use_cassette('cassettes/edit_mention.yaml')
     def edit_mention(self, mention_id: str, label: str) -> Dict[str, Any]:
         data = {"label": label}
         return self._request("PATCH", f"/mentions/{mention_id}", json=data)
 
-    @vcr.use_cassette('cassettes/delete_mention.yaml')
     def delete_mention(self, mention_id: str) -> Dict[str, Any]:
         return self._request("DELETE", f"/mentions/{mention_id}")
\ No newline at end of file
@@ -0,0 +1,145 @@
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from timeular_models import TimeEntry, to_model
+
+
+def _millis(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+class EntryFrame:
+    """Time entries as columns: epoch-millisecond int64 start/stop arrays and
+    categorical activity and tag codes, so rollups run as batched NumPy
+    operations instead of Python loops over dicts.
+
+    Running entries (no ``stopped_at``) are treated as stopping at ``now``.
+    """
+
+    __slots__ = ("ids", "started", "stopped", "activity_codes", "activities", "tag_entries", "tag_codes", "tags")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        started: np.ndarray,
+        stopped: np.ndarray,
+        activity_codes: np.ndarray,
+        activities: np.ndarray,
+        tag_entries: np.ndarray,
+        tag_codes: np.ndarray,
+        tags: np.ndarray,
+    ) -> None:
+        self.ids = ids
+        self.started = started
+        self.stopped = stopped
+        self.activity_codes = activity_codes
+        self.activities = activities
+        self.tag_entries = tag_entries
+        self.tag_codes = tag_codes
+        self.tags = tags
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Any], now: Optional[datetime] = None) -> "EntryFrame":
+        now_millis = _millis(now or datetime.now(timezone.utc))
+        ids: List[str] = []
+        started: List[int] = []
+        stopped: List[int] = []
+        activity_codes: List[int] = []
+        activities: Dict[Optional[str], int] = {}
+        tag_entries: List[int] = []
+        tag_codes: List[int] = []
+        tags: Dict[str, int] = {}
+        for data in entries:
+            entry = to_model(TimeEntry, data)
+            if entry.started_at is None:
+                continue
+            index = len(ids)
+            ids.append(entry.id)
+            started.append(_millis(entry.started_at))
+            stopped.append(_millis(entry.stopped_at) if entry.stopped_at is not None else now_millis)
+            activity_codes.append(activities.setdefault(entry.activity_id, len(activities)))
+            for tag in entry.tags:
+                tag_id = str(tag.get("id") if isinstance(tag, dict) else tag)
+                tag_entries.append(index)
+                tag_codes.append(tags.setdefault(tag_id, len(tags)))
+        return cls(
+            np.array(ids, dtype=object),
+            np.array(started, dtype=np.int64),
+            np.array(stopped, dtype=np.int64),
+            np.array(activity_codes, dtype=np.int32),
+            np.array(list(activities), dtype=object),
+            np.array(tag_entries, dtype=np.int64),
+            np.array(tag_codes, dtype=np.int32),
+            np.array(list(tags), dtype=object),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def durations(self) -> np.ndarray:
+        """Entry durations in seconds."""
+        return (self.stopped - self.started) / 1000.0
+
+    def totals_by_activity(self) -> Dict[Optional[str], float]:
+        totals = np.bincount(self.activity_codes, weights=self.durations(), minlength=len(self.activities))
+        return dict(zip(self.activities.tolist(), totals.tolist()))
+
+    def totals_by_tag(self) -> Dict[str, float]:
+        weights = self.durations()[self.tag_entries]
+        totals = np.bincount(self.tag_codes, weights=weights, minlength=len(self.tags))
+        return dict(zip(self.tags.tolist(), totals.tolist()))
+
+    def totals_by_day(self, tz: tzinfo = timezone.utc, activity_id: Optional[str] = None) -> Dict[date, float]:
+        """Seconds tracked per local calendar day in ``tz``.
+
+        Entries that cross midnight are split between the days they cover.
+        Pass ``activity_id`` to restrict the rollup to one activity.
+        """
+        started, stopped = self.started, self.stopped
+        if activity_id is not None:
+            matches = np.flatnonzero(self.activities == activity_id)
+            mask = np.isin(self.activity_codes, matches)
+            started, stopped = started[mask], stopped[mask]
+        if not len(started):
+            return {}
+        first = datetime.fromtimestamp(started.min() / 1000, tz).date()
+        last = datetime.fromtimestamp(stopped.max() / 1000, tz).date()
+        days = [first + timedelta(days=n) for n in range((last - first).days + 2)]
+        bounds = np.array([_millis(datetime.combine(day, time(), tzinfo=tz)) for day in days], dtype=np.int64)
+        # Shift to the earliest bound so the prefix sums stay far from int64 overflow.
+        base = bounds[0]
+        covered = _covered_before(np.sort(started - base), np.sort(stopped - base), bounds - base)
+        totals = np.diff(covered) / 1000.0
+        return {day: total for day, total in zip(days, totals.tolist()) if total}
+
+    def overlaps(self) -> List[Tuple[str, str]]:
+        """All pairs ``(earlier_id, later_id)`` where an entry starts before an
+        earlier-starting entry has stopped."""
+        if len(self) < 2:
+            return []
+        order = np.lexsort((self.stopped, self.started))
+        started, stopped = self.started[order], self.stopped[order]
+        # With starts sorted, the entries overlapping entry j from the right
+        # are the contiguous run j+1 .. (number of starts before stopped[j]).
+        positions = np.arange(len(order))
+        ends = np.searchsorted(started, stopped, side="left")
+        counts = np.maximum(ends - positions - 1, 0)
+        earlier = np.repeat(positions, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        later = earlier + 1 + offsets
+        return list(zip(self.ids[order[earlier]].tolist(), self.ids[order[later]].tolist()))
+
+
+def _covered_before(started: np.ndarray, stopped: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    # For every bound t, the tracked time before t summed over all entries:
+    # sum(t - start for start < t) - sum(t - stop for stop < t).
+    started_prefix = np.concatenate(([0], np.cumsum(started)))
+    stopped_prefix = np.concatenate(([0], np.cumsum(stopped)))
+    started_count = np.searchsorted(started, bounds)
+    stopped_count = np.searchsorted(stopped, bounds)
+    return (
+        started_count * bounds - started_prefix[started_count]
+        - (stopped_count * bounds - stopped_prefix[stopped_count])
+    )
@@ -0,0 +1,73 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict
+
+try:
+    import numpy  # noqa: F401
+    from timeular_analytics import EntryFrame
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # pragma: no cover
+    ZoneInfo = None  # type: ignore[assignment,misc]
+
+
+def entry(entry_id: str, activity_id: str, start: str, stop: Any, tags: Any = ()) -> Dict[str, Any]:
+    return {"id": entry_id, "activityId": activity_id, "duration": {"startedAt": start, "stoppedAt": stop},
+            "note": {"tags": [{"id": t} for t in tags]}}
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestEntryFrame(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.frame = EntryFrame.from_entries([
+            entry("1", "work", "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000", tags=[7]),
+            entry("2", "work", "2023-01-01T09:30:00.000", "2023-01-01T09:45:00.000", tags=[7, 8]),
+            entry("3", "rest", "2023-01-01T23:00:00.000", "2023-01-02T01:00:00.000"),
+            entry("4", "rest", "2023-01-02T12:00:00.000", None),
+        ], now=datetime(2023, 1, 2, 12, 30, tzinfo=timezone.utc))
+
+    def test_columns(self) -> None:
+        self.assertEqual(self.frame.started.dtype, numpy.int64)
+        self.assertEqual(self.frame.activities.tolist(), ["work", "rest"])
+        self.assertEqual(self.frame.activity_codes.tolist(), [0, 0, 1, 1])
+        self.assertEqual(self.frame.durations().tolist(), [3600.0, 900.0, 7200.0, 1800.0])
+
+    def test_grouped_totals(self) -> None:
+        self.assertEqual(self.frame.totals_by_activity(), {"work": 4500.0, "rest": 9000.0})
+        self.assertEqual(self.frame.totals_by_tag(), {"7": 4500.0, "8": 900.0})
+
+    def test_totals_by_day_splits_at_midnight(self) -> None:
+        self.assertEqual(self.frame.totals_by_day(), {date(2023, 1, 1): 8100.0, date(2023, 1, 2): 5400.0})
+        self.assertEqual(self.frame.totals_by_day(activity_id="rest"), {date(2023, 1, 1): 3600.0, date(2023, 1, 2): 5400.0})
+
+    @unittest.skipIf(ZoneInfo is None, "zoneinfo is not available")
+    def test_totals_by_day_in_timezone(self) -> None:
+        totals = self.frame.totals_by_day(ZoneInfo("America/New_York"))
+        self.assertEqual(totals, {date(2023, 1, 1): 11700.0, date(2023, 1, 2): 1800.0})
+        fixed = self.frame.totals_by_day(timezone(timedelta(hours=2)))
+        self.assertEqual(fixed, {date(2023, 1, 1): 4500.0, date(2023, 1, 2): 9000.0})
+
+    def test_overlaps(self) -> None:
+        self.assertEqual(self.frame.overlaps(), [("1", "2")])
+
+    def test_overlaps_reports_every_pair(self) -> None:
+        frame = EntryFrame.from_entries([
+            entry("a", "work", "2023-01-01T09:00:00.000", "2023-01-01T09:10:00.000"),
+            entry("c", "work", "2023-01-01T09:02:00.000", "2023-01-01T09:04:00.000"),
+            entry("b", "work", "2023-01-01T09:01:00.000", "2023-01-01T09:03:00.000"),
+            entry("d", "work", "2023-01-01T09:10:00.000", "2023-01-01T09:20:00.000"),
+        ])
+        self.assertEqual(frame.overlaps(), [("a", "b"), ("a", "c"), ("b", "c")])
+
+    def test_empty(self) -> None:
+        frame = EntryFrame.from_entries([])
+        self.assertEqual(frame.totals_by_activity(), {})
+        self.assertEqual(frame.totals_by_day(), {})
+        self.assertEqual(frame.overlaps(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,356 @@
+import asyncio
+import time
+import aiohttp
+from datetime import timedelta
+from typing import Dict, Any, AsyncIterator, Iterable, List, Mapping, Optional, Tuple
+
+from timeular import BASE_URL, DateLike, TokenCache, WindowMerger, date_windows
+from timeular_bulk import BulkResult, run_bulk_async
+from timeular_cache import ResponseCache
+from timeular_json import loads
+from timeular_metrics import Hook, Metrics, RequestEvent, run_hooks
+from timeular_models import TimeEntry, convert_payload, to_model
+from timeular_retry import RateLimiter, RetryPolicy
+from timeular_singleflight import AsyncSingleFlight
+
+
+class AsyncTimeularClient:
+    """asyncio counterpart of TimeularClient backed by one pooled aiohttp connector."""
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        max_concurrency: int = 100,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        token_cache: Optional[TokenCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        models: bool = False,
+        metrics: Optional[Metrics] = None,
+        single_flight: bool = False,
+        session: Any = None,
+        base_url: str = BASE_URL,
+    ) -> None:
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url
+        self.token: Optional[str] = None
+        self.token_cache = token_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        self.models = models
+        self.metrics = metrics
+        self.pre_request_hooks: List[Hook] = []
+        self.post_request_hooks: List[Hook] = [metrics] if metrics is not None else []
+        self.single_flight = AsyncSingleFlight() if single_flight else None
+        self.max_concurrency = max_concurrency
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout or aiohttp.ClientTimeout(total=30.0, connect=5.0)
+        if session is not None and connector is not None:
+            raise ValueError("pass either session or connector, not both")
+        self._connector = connector
+        # A session passed in (anything shaped like an aiohttp.ClientSession)
+        # is used instead of one of our own and left open by close().
+        self._external_session = session
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._sign_in_lock: Optional[asyncio.Lock] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions, semaphores and locks must be created inside the
+        # running loop, so they are built on first use rather than in __init__.
+        if self._session is None and self._external_session is not None:
+            self._session = self._external_session
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._sign_in_lock = asyncio.Lock()
+        if self._session is None:
+            owns_connector = self._connector is None
+            connector = self._connector or aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=owns_connector,
+                timeout=self.timeout,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._sign_in_lock = asyncio.Lock()
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            session, self._session = self._session, None
+            if session is not self._external_session:
+                await session.close()
+
+    async def __aenter__(self) -> "AsyncTimeularClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _get_access_token(self) -> str:
+        session = self._get_session()
+        url = f"{self.base_url}/developer/sign-in"
+        async with session.post(url, json={"apiKey": self.api_key, "apiSecret": self.api_secret}) as response:
+            response.raise_for_status()
+            return (await response.json())["token"]
+
+    async def _refresh_token(self, stale: Optional[str]) -> str:
+        self._get_session()
+        assert self._sign_in_lock is not None
+        async with self._sign_in_lock:
+            if self.token is not None and self.token != stale:
+                return self.token
+            loop = asyncio.get_running_loop()
+            token = None
+            if self.token_cache is not None:
+                token = await loop.run_in_executor(None, self.token_cache.get, self.api_key)
+            if token is None or token == stale:
+                token = await self._get_access_token()
+                if self.token_cache is not None:
+                    await loop.run_in_executor(None, self.token_cache.set, self.api_key, token)
+            self.token = token
+            return token
+
+    async def _exchange(
+        self, session: aiohttp.ClientSession, method: str, endpoint: str, url: str, attempt: int, **kwargs: Any
+    ) -> Tuple[aiohttp.ClientResponse, bytes]:
+        event = None
+        if self.pre_request_hooks or self.post_request_hooks:
+            event = RequestEvent(method, endpoint, attempt)
+            run_hooks(self.pre_request_hooks, event)
+            started = time.perf_counter()
+        try:
+            assert self._semaphore is not None
+            async with self._semaphore:
+                async with session.request(method, url, **kwargs) as response:
+                    # Error bodies are read too so the connection can go back to the pool.
+                    body = await response.read()
+        except Exception as exc:
+            if event is not None:
+                event.error = exc
+            raise
+        else:
+            if event is not None:
+                event.status = response.status
+                length = response.request_info.headers.get("Content-Length")
+                event.request_bytes = int(length) if length and length.isdigit() else 0
+                event.response_bytes = len(body)
+            return response, body
+        finally:
+            if event is not None:
+                event.elapsed = time.perf_counter() - started
+                run_hooks(self.post_request_hooks, event)
+
+    async def _send(
+        self, method: str, endpoint: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        session = self._get_session()
+        token = self.token or await self._refresh_token(None)
+        url = f"{self.base_url}{endpoint}"
+        refreshed = False
+        attempt = 0
+        self.retry_policy.record_request()
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            request_headers = {"Authorization": f"Bearer {token}"}
+            if headers:
+                request_headers.update(headers)
+            response, body = await self._exchange(session, method, endpoint, url, attempt, headers=request_headers, **kwargs)
+            status = response.status
+            if status == 401 and not refreshed:
+                token = await self._refresh_token(token)
+                refreshed = True
+                continue
+            delay = self.retry_policy.retry_delay(method, status, response.headers, attempt)
+            if delay is None:
+                response.raise_for_status()
+                return status, response.headers, body
+            if self.rate_limiter is not None and status in self.retry_policy.statuses:
+                self.rate_limiter.pause(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _decode(body: bytes) -> Any:
+        return loads(body) if body.strip() else None
+
+    async def _request(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+        payload = await self._fetch(method, endpoint, **kwargs)
+        return convert_payload(payload) if self.models else payload
+
+    async def _fetch(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+        cache = self.cache
+        if method != "GET":
+            try:
+                return self._decode((await self._send(method, endpoint, **kwargs))[2])
+            finally:
+                if cache is not None:
+                    cache.invalidate(endpoint)
+                if self.single_flight is not None:
+                    self.single_flight.forget()
+        if kwargs:
+            return self._decode((await self._send(method, endpoint, **kwargs))[2])
+        if self.single_flight is not None:
+            return self._decode(await self.single_flight.do(endpoint, lambda: self._get_body(endpoint)))
+        return self._decode(await self._get_body(endpoint))
+
+    async def _get_body(self, endpoint: str) -> bytes:
+        cache = self.cache
+        if cache is None or cache.ttl_for(endpoint) is None:
+            return (await self._send("GET", endpoint))[2]
+        body, etag, generation = cache.lookup(endpoint)
+        if body is not None:
+            return body
+        status, headers, response_body = await self._send(
+            "GET", endpoint, headers={"If-None-Match": etag} if etag else None
+        )
+        if status == 304:
+            body = cache.revalidate(endpoint)
+            if body is None:
+                status, headers, response_body = await self._send("GET", endpoint)
+        if body is None:
+            body = response_body
+            cache.store(endpoint, body, headers.get("ETag"), generation)
+        return body
+
+    async def _conditional_request(
+        self, method: str, endpoint: str, etag: Optional[str] = None, **kwargs: Any
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        status, headers, body = await self._send(method, endpoint, headers={"If-None-Match": etag} if etag else None, **kwargs)
+        if status == 304:
+            return None, etag
+        return body, headers.get("ETag")
+
+    async def get_activities(self) -> Dict[str, Any]:
+        return await self._request("GET", "/activities")
+
+    async def create_activity(self, name: str, color: str) -> Dict[str, Any]:
+        data = {"name": name, "color": color}
+        return await self._request("POST", "/activities", json=data)
+
+    async def edit_activity(self, activity_id: str, name: str, color: str) -> Dict[str, Any]:
+        data = {"name": name, "color": color}
+        return await self._request("PATCH", f"/activities/{activity_id}", json=data)
+
+    async def archive_activity(self, activity_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"/activities/{activity_id}")
+
+    async def get_time_entries(self) -> Dict[str, Any]:
+        return await self._request("GET", "/time-entries")
+
+    async def stop_current_activity(self) -> Dict[str, Any]:
+        return await self._request("DELETE", "/tracking")
+
+    async def get_current_tracking(self) -> Dict[str, Any]:
+        return await self._request("GET", "/tracking")
+
+    async def start_tracking(self, activity_id: str) -> Dict[str, Any]:
+        data = {"activityId": activity_id}
+        return await self._request("POST", "/tracking", json=data)
+
+    async def edit_tracking(self, tracking_id: str, started_at: str, stopped_at: str) -> Dict[str, Any]:
+        data = {"startedAt": started_at, "stoppedAt": stopped_at}
+        return await self._request("PATCH", f"/tracking/{tracking_id}", json=data)
+
+    async def remove_tracking(self, tracking_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"/tracking/{tracking_id}")
+
+    async def cancel_tracking(self) -> Dict[str, Any]:
+        return await self._request("DELETE", "/tracking")
+
+    async def find_time_entry(self, time_entry_id: str) -> Dict[str, Any]:
+        return await self._request("GET", f"/time-entries/{time_entry_id}")
+
+    async def create_time_entry(self, activity_id: str, started_at: str, stopped_at: str) -> Dict[str, Any]:
+        data = {
+            "activityId": activity_id,
+            "startedAt": started_at,
+            "stoppedAt": stopped_at
+        }
+        return await self._request("POST", "/time-entries", json=data)
+
+    async def edit_time_entry(self, time_entry_id: str, started_at: str, stopped_at: str) -> Dict[str, Any]:
+        data = {
+            "startedAt": started_at,
+            "stoppedAt": stopped_at
+        }
+        return await self._request("PATCH", f"/time-entries/{time_entry_id}", json=data)
+
+    async def delete_time_entry(self, time_entry_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"/time-entries/{time_entry_id}")
+
+    def bulk_create_time_entries(
+        self, entries: Iterable[Mapping[str, str]], max_concurrency: int = 100, ordered: bool = False
+    ) -> AsyncIterator[BulkResult]:
+        return run_bulk_async(lambda entry: self.create_time_entry(**entry), entries, max_concurrency, ordered)
+
+    def bulk_edit_time_entries(
+        self, entries: Iterable[Mapping[str, str]], max_concurrency: int = 100, ordered: bool = False
+    ) -> AsyncIterator[BulkResult]:
+        return run_bulk_async(lambda entry: self.edit_time_entry(**entry), entries, max_concurrency, ordered)
+
+    def bulk_delete_time_entries(
+        self, time_entry_ids: Iterable[str], max_concurrency: int = 100, ordered: bool = False
+    ) -> AsyncIterator[BulkResult]:
+        return run_bulk_async(self.delete_time_entry, time_entry_ids, max_concurrency, ordered)
+
+    async def generate_report(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        data = {
+            "startDate": start_date,
+            "endDate": end_date
+        }
+        return await self._request("POST", "/reports/time-entries", json=data)
+
+    async def iter_time_entries(
+        self,
+        start_date: DateLike,
+        end_date: DateLike,
+        window: timedelta = timedelta(days=30),
+    ) -> AsyncIterator[TimeEntry]:
+        merger = WindowMerger()
+        for window_start, window_end in date_windows(start_date, end_date, window):
+            report = await self.generate_report(window_start.isoformat(), window_end.isoformat())
+            for data in merger.window(report.get("timeEntries") or ()):
+                yield to_model(TimeEntry, data)
+
+    async def get_tags(self) -> Dict[str, Any]:
+        return await self._request("GET", "/tags")
+
+    async def create_tag(self, label: str) -> Dict[str, Any]:
+        data = {"label": label}
+        return await self._request("POST", "/tags", json=data)
+
+    async def edit_tag(self, tag_id: str, label: str) -> Dict[str, Any]:
+        data = {"label": label}
+        return await self._request("PATCH", f"/tags/{tag_id}", json=data)
+
+    async def delete_tag(self, tag_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"/tags/{tag_id}")
+
+    async def get_mentions(self) -> Dict[str, Any]:
+        return await self._request("GET", "/mentions")
+
+    async def create_mention(self, label: str) -> Dict[str, Any]:
+        data = {"label": label}
+        return await self._request("POST", "/mentions", json=data)
+
+    async def edit_mention(self, mention_id: str, label: str) -> Dict[str, Any]:
+        data = {"label": label}
+        return await self._request("PATCH", f"/mentions/{mention_id}", json=data)
+
+    async def delete_mention(self, mention_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"/mentions/{mention_id}")
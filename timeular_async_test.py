@@ -0,0 +1,182 @@
+import asyncio
+import json
+import unittest
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock, MagicMock, Mock
+from timeular_async import AsyncTimeularClient
+from timeular_cache import ResponseCache
+from timeular_metrics import Metrics
+from typing import Any, Dict
+
+BASE = "https://api.timeular.com/api/v4"
+
+
+def mock_response(payload: Dict[str, Any]) -> MagicMock:
+    response = MagicMock()
+    response.json = AsyncMock(return_value=payload)
+    response.read = AsyncMock(return_value=json.dumps(payload).encode())
+    response.raise_for_status = Mock()
+    context = MagicMock()
+    context.__aenter__.return_value = response
+    return context
+
+
+class TestAsyncTimeularClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.client = AsyncTimeularClient("fake_api_key", "fake_api_secret", max_concurrency=2)
+        post = patch('timeular_async.aiohttp.ClientSession.post', return_value=mock_response({"token": "fake_token"}))
+        self.mock_post = post.start()
+        self.addCleanup(post.stop)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_endpoints(self, mock_request: Any) -> None:
+        cases = [
+            ("get_activities", (), "GET", "/activities", None),
+            ("create_activity", ("Test", "#FFFFFF"), "POST", "/activities", {"name": "Test", "color": "#FFFFFF"}),
+            ("edit_activity", ("a1", "Test", "#000000"), "PATCH", "/activities/a1", {"name": "Test", "color": "#000000"}),
+            ("archive_activity", ("a1",), "DELETE", "/activities/a1", None),
+            ("get_time_entries", (), "GET", "/time-entries", None),
+            ("stop_current_activity", (), "DELETE", "/tracking", None),
+            ("get_current_tracking", (), "GET", "/tracking", None),
+            ("start_tracking", ("a1",), "POST", "/tracking", {"activityId": "a1"}),
+            ("edit_tracking", ("t1", "s", "e"), "PATCH", "/tracking/t1", {"startedAt": "s", "stoppedAt": "e"}),
+            ("remove_tracking", ("t1",), "DELETE", "/tracking/t1", None),
+            ("cancel_tracking", (), "DELETE", "/tracking", None),
+            ("find_time_entry", ("e1",), "GET", "/time-entries/e1", None),
+            ("create_time_entry", ("a1", "s", "e"), "POST", "/time-entries", {"activityId": "a1", "startedAt": "s", "stoppedAt": "e"}),
+            ("edit_time_entry", ("e1", "s", "e"), "PATCH", "/time-entries/e1", {"startedAt": "s", "stoppedAt": "e"}),
+            ("delete_time_entry", ("e1",), "DELETE", "/time-entries/e1", None),
+            ("generate_report", ("2023-01-01", "2023-01-31"), "POST", "/reports/time-entries", {"startDate": "2023-01-01", "endDate": "2023-01-31"}),
+            ("get_tags", (), "GET", "/tags", None),
+            ("create_tag", ("t",), "POST", "/tags", {"label": "t"}),
+            ("edit_tag", ("g1", "t"), "PATCH", "/tags/g1", {"label": "t"}),
+            ("delete_tag", ("g1",), "DELETE", "/tags/g1", None),
+            ("get_mentions", (), "GET", "/mentions", None),
+            ("create_mention", ("m",), "POST", "/mentions", {"label": "m"}),
+            ("edit_mention", ("m1", "m"), "PATCH", "/mentions/m1", {"label": "m"}),
+            ("delete_mention", ("m1",), "DELETE", "/mentions/m1", None),
+        ]
+        for name, args, method, endpoint, data in cases:
+            with self.subTest(name):
+                mock_request.reset_mock()
+                mock_request.return_value = mock_response({"name": name})
+                result = await getattr(self.client, name)(*args)
+                self.assertEqual(result, {"name": name})
+                kwargs: Dict[str, Any] = {"headers": {"Authorization": "Bearer fake_token"}}
+                if data is not None:
+                    kwargs["json"] = data
+                mock_request.assert_called_once_with(method, BASE + endpoint, **kwargs)
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_concurrent_calls_sign_in_once_and_respect_semaphore(self, mock_request: Any) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def read() -> bytes:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return b"{}"
+
+        context = mock_response({})
+        context.__aenter__.return_value.read = read
+        mock_request.return_value = context
+
+        await asyncio.gather(*(self.client.find_time_entry(str(i)) for i in range(10)))
+        self.assertEqual(mock_request.call_count, 10)
+        self.assertEqual(self.mock_post.call_count, 1)
+        self.assertEqual(peak, 2)
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_401_refreshes_token_once(self, mock_request: Any) -> None:
+        def request(method: str, url: str, headers: Dict[str, str], **kwargs: Any) -> MagicMock:
+            context = mock_response({"timeEntry": {}})
+            expired = headers["Authorization"] == "Bearer expired_token"
+            context.__aenter__.return_value.status = 401 if expired else 200
+            return context
+
+        mock_request.side_effect = request
+        self.client.token = "expired_token"
+        results = await asyncio.gather(*(self.client.find_time_entry(str(i)) for i in range(5)))
+        self.assertEqual(results, [{"timeEntry": {}}] * 5)
+        self.assertEqual(self.mock_post.call_count, 1)
+        self.assertEqual(self.client.token, "fake_token")
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_iter_time_entries(self, mock_request: Any) -> None:
+        mock_request.side_effect = [
+            mock_response({"timeEntries": [{"id": "1", "startedAt": "2023-01-01T09:00:00.000"}]}),
+            mock_response({"timeEntries": [{"id": "1", "startedAt": "2023-01-01T09:00:00.000"}, {"id": "2"}]}),
+        ]
+        entries = [entry.id async for entry in self.client.iter_time_entries("2023-01-01", "2023-01-02", window=timedelta(days=1))]
+        self.assertEqual(entries, ["1", "2"])
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_iter_time_entries_spanning_many_windows(self, mock_request: Any) -> None:
+        mock_request.side_effect = [
+            mock_response({"timeEntries": [{"id": "1"}]}),
+            mock_response({"timeEntries": [{"id": "1"}]}),
+            mock_response({"timeEntries": [{"id": "1"}, {"id": "2"}]}),
+        ]
+        entries = [entry.id async for entry in self.client.iter_time_entries("2023-01-01", "2023-01-03", window=timedelta(days=1))]
+        self.assertEqual(entries, ["1", "2"])
+
+    @patch('timeular_async.asyncio.sleep')
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_retries_503(self, mock_request: Any, mock_sleep: Any) -> None:
+        unavailable = mock_response({})
+        unavailable.__aenter__.return_value.status = 503
+        unavailable.__aenter__.return_value.headers = {"Retry-After": "1"}
+        mock_request.side_effect = [unavailable, mock_response({"tags": []})]
+        self.assertEqual(await self.client.get_tags(), {"tags": []})
+        self.assertEqual(mock_request.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_cache(self, mock_request: Any) -> None:
+        self.client.cache = ResponseCache()
+        mock_request.side_effect = [mock_response({"mentions": [1]}), mock_response({}), mock_response({"mentions": []})]
+        self.assertEqual(await self.client.get_mentions(), {"mentions": [1]})
+        self.assertEqual(await self.client.get_mentions(), {"mentions": [1]})
+        await self.client.delete_mention("1")
+        self.assertEqual(await self.client.get_mentions(), {"mentions": []})
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_metrics(self, mock_request: Any) -> None:
+        metrics = Metrics()
+        self.client.post_request_hooks.append(metrics)
+        mock_request.return_value = mock_response({"timeEntry": {}})
+        mock_request.return_value.__aenter__.return_value.status = 200
+        mock_request.return_value.__aenter__.return_value.request_info.headers = {}
+        await self.client.find_time_entry("1")
+        await self.client.find_time_entry("2")
+        stats = metrics.to_dict()["GET /time-entries/{id}"]
+        self.assertEqual(stats["count"], 2)
+        self.assertEqual(stats["response_bytes"], 2 * len(b'{"timeEntry": {}}'))
+
+    @patch('timeular_async.aiohttp.ClientSession.request')
+    async def test_single_flight(self, mock_request: Any) -> None:
+        client = AsyncTimeularClient("fake_api_key", "fake_api_secret", single_flight=True)
+        self.addAsyncCleanup(client.close)
+
+        async def read() -> bytes:
+            await asyncio.sleep(0.01)
+            return b'{"timeEntry": {"id": "1"}}'
+
+        mock_request.return_value = mock_response({})
+        mock_request.return_value.__aenter__.return_value.read = AsyncMock(side_effect=read)
+        results = await asyncio.gather(*(client.find_time_entry("1") for _ in range(5)))
+        self.assertEqual(results, [{"timeEntry": {"id": "1"}}] * 5)
+        self.assertEqual(mock_request.call_count, 1)
+        await client.find_time_entry("1")
+        self.assertEqual(mock_request.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
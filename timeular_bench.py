@@ -0,0 +1,196 @@
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+from timeular import TimeularClient
+from timeular_mockserver import MockTimeularServer
+
+
+class BenchResult(NamedTuple):
+    name: str
+    operations: int
+    requests: int
+    seconds: float
+    p50: float
+    p99: float
+    peak_bytes: int
+
+    @property
+    def throughput(self) -> float:
+        return self.operations / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._asdict(), throughput=self.throughput)
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _timed(op: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    op()
+    return time.perf_counter() - started
+
+
+def _peak_bytes(op: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        op()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _result(name: str, server: MockTimeularServer, run: Callable[[], List[float]], op: Callable[[], Any]) -> BenchResult:
+    op()  # warm up the pool and token
+    requests = server.requests
+    started = time.perf_counter()
+    latencies = run()
+    seconds = time.perf_counter() - started
+    requests = server.requests - requests
+    return BenchResult(
+        name, len(latencies), requests, seconds, percentile(latencies, 0.5), percentile(latencies, 0.99), _peak_bytes(op)
+    )
+
+
+def _edits(server: MockTimeularServer, count: int) -> List[Dict[str, str]]:
+    return [
+        {"time_entry_id": entry_id, "started_at": "2023-01-01T09:00:00.000", "stopped_at": "2023-01-01T10:00:00.000"}
+        for entry_id in list(server.api.time_entries)[:count]
+    ]
+
+
+def run_sync(
+    server: MockTimeularServer, iterations: int, concurrency: int, bulk_size: int
+) -> List[BenchResult]:
+    client = TimeularClient("bench_key", "bench_secret", pool_maxsize=concurrency, base_url=server.url)
+    edits = _edits(server, bulk_size)
+
+    def sign_in() -> str:
+        client.token = None
+        return client.token
+
+    def sequential(op: Callable[[], Any]) -> Callable[[], List[float]]:
+        return lambda: [_timed(op) for _ in range(iterations)]
+
+    def threaded(op: Callable[[], Any]) -> Callable[[], List[float]]:
+        def run() -> List[float]:
+            with ThreadPoolExecutor(concurrency) as executor:
+                return list(executor.map(lambda _: _timed(op), range(iterations)))
+        return run
+
+    scenarios: Dict[str, Callable[[], Any]] = {
+        "sign_in": sign_in,
+        "get_time_entries": client.get_time_entries,
+        "generate_report": lambda: client.generate_report("2023-01-01", "2023-12-31"),
+        "bulk_edit": lambda: list(client.bulk_edit_time_entries(edits, max_workers=concurrency)),
+    }
+    try:
+        results = [_result(name, server, sequential(op), op) for name, op in scenarios.items()]
+        results.append(_result("get_time_entries_threads", server, threaded(client.get_time_entries), client.get_time_entries))
+        return results
+    finally:
+        client.close()
+
+
+def run_async(server: MockTimeularServer, iterations: int, concurrency: int, bulk_size: int) -> List[BenchResult]:
+    from timeular_async import AsyncTimeularClient
+
+    async def main() -> List[BenchResult]:
+        async with AsyncTimeularClient("bench_key", "bench_secret", max_concurrency=concurrency, base_url=server.url) as client:
+            edits = _edits(server, bulk_size)
+
+            async def timed(op: Callable[[], Any]) -> float:
+                started = time.perf_counter()
+                await op()
+                return time.perf_counter() - started
+
+            async def bulk_edit() -> List[Any]:
+                return [result async for result in client.bulk_edit_time_entries(edits, max_concurrency=concurrency)]
+
+            results = []
+            for name, op in (("get_time_entries_async", client.get_time_entries), ("bulk_edit_async", bulk_edit)):
+                await op()
+                requests = server.requests
+                started = time.perf_counter()
+                latencies = await asyncio.gather(*(timed(op) for _ in range(iterations)))
+                seconds = time.perf_counter() - started
+                requests = server.requests - requests
+                tracemalloc.start()
+                try:
+                    await op()
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                results.append(BenchResult(
+                    name, len(latencies), requests, seconds, percentile(latencies, 0.5), percentile(latencies, 0.99), peak
+                ))
+            return results
+
+    return asyncio.run(main())
+
+
+def run_benchmarks(
+    entries: int = 100,
+    note_size: int = 32,
+    latency: float = 0.0,
+    throttle_every: int = 0,
+    iterations: int = 100,
+    concurrency: int = 8,
+    bulk_size: int = 20,
+    include_async: Optional[bool] = None,
+) -> List[BenchResult]:
+    if include_async is None:
+        try:
+            import aiohttp  # noqa: F401
+            include_async = True
+        except ImportError:
+            include_async = False
+    with MockTimeularServer(entries, note_size, latency, throttle_every) as server:
+        results = run_sync(server, iterations, concurrency, bulk_size)
+        if include_async:
+            results.extend(run_async(server, iterations, concurrency, bulk_size))
+    return results
+
+
+def format_results(results: Sequence[BenchResult]) -> str:
+    lines = [f"{'scenario':<26} {'ops':>6} {'requests':>9} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>9}"]
+    for r in results:
+        lines.append(
+            f"{r.name:<26} {r.operations:>6} {r.requests:>9} {r.throughput:>10.1f} "
+            f"{r.p50 * 1000:>9.2f} {r.p99 * 1000:>9.2f} {r.peak_bytes / 1024:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Timeular clients against a local mock API.")
+    parser.add_argument("--entries", type=int, default=100, help="time entries per list/report response")
+    parser.add_argument("--note-size", type=int, default=32, help="bytes of note text per time entry")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the server waits before each response")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every Nth request with 429")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--bulk-size", type=int, default=20)
+    parser.add_argument("--no-async", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+    results = run_benchmarks(
+        args.entries, args.note_size, args.latency, args.throttle_every,
+        args.iterations, args.concurrency, args.bulk_size, False if args.no_async else None,
+    )
+    if args.json:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+    else:
+        print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import unittest
+from timeular_bench import format_results, percentile, run_benchmarks
+
+
+class TestBench(unittest.TestCase):
+
+    def test_percentile(self) -> None:
+        samples = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(samples, 0.5), 50.0)
+        self.assertEqual(percentile(samples, 0.99), 99.0)
+        self.assertEqual(percentile([3.0], 0.99), 3.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_run_benchmarks(self) -> None:
+        results = run_benchmarks(entries=5, iterations=3, concurrency=2, bulk_size=2, throttle_every=7)
+        names = [r.name for r in results]
+        self.assertEqual(names[:5], ["sign_in", "get_time_entries", "generate_report", "bulk_edit", "get_time_entries_threads"])
+        by_name = {r.name: r for r in results}
+        self.assertEqual(by_name["get_time_entries"].operations, 3)
+        self.assertGreaterEqual(by_name["bulk_edit"].requests, 6)
+        self.assertTrue(all(r.p50 <= r.p99 and r.peak_bytes > 0 for r in results))
+        self.assertIn("get_time_entries_threads", format_results(results))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+from collections import deque
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future
+
+
+class BulkResult(NamedTuple):
+    """Outcome of one operation of a bulk call.
+
+    ``index`` is the position of ``operation`` in the input; exactly one of
+    ``result`` and ``error`` is set.
+    """
+
+    index: int
+    operation: Any
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_bulk(
+    call: Callable[[Any], Dict[str, Any]],
+    operations: Iterable[Any],
+    max_workers: int = 8,
+    ordered: bool = False,
+) -> Iterator[BulkResult]:
+    """Apply ``call`` to every operation on a thread pool, yielding results as they finish.
+
+    Operations are pulled from the iterable lazily, with at most
+    ``2 * max_workers`` submitted at a time, so arbitrarily long inputs run in
+    bounded memory. A failing operation is reported in its BulkResult and
+    does not stop the others. With ``ordered=True`` results come back in
+    input order instead of completion order.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    source = enumerate(operations)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Dict["Future[Dict[str, Any]]", Tuple[int, Any]] = {}
+        queue: Deque["Future[Dict[str, Any]]"] = deque()
+
+        def submit_next() -> None:
+            for index, operation in source:
+                future = executor.submit(call, operation)
+                pending[future] = (index, operation)
+                if ordered:
+                    queue.append(future)
+                return
+
+        try:
+            for _ in range(2 * max_workers):
+                submit_next()
+            while pending:
+                if ordered:
+                    done = [queue.popleft()]
+                    wait(done)
+                else:
+                    done = list(wait(pending, return_when=FIRST_COMPLETED).done)
+                for future in done:
+                    index, operation = pending.pop(future)
+                    submit_next()
+                    yield _result(index, operation, future.exception(), future)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def run_bulk_async(
+    call: Callable[[Any], Awaitable[Dict[str, Any]]],
+    operations: Iterable[Any],
+    max_concurrency: int = 8,
+    ordered: bool = False,
+) -> AsyncIterator[BulkResult]:
+    """asyncio counterpart of run_bulk with at most ``max_concurrency`` operations in flight."""
+    import asyncio
+
+    source = enumerate(operations)
+    pending: Dict["asyncio.Future[Dict[str, Any]]", Tuple[int, Any]] = {}
+    queue: Deque["asyncio.Future[Dict[str, Any]]"] = deque()
+
+    def submit_next() -> None:
+        for index, operation in source:
+            task = asyncio.ensure_future(call(operation))
+            pending[task] = (index, operation)
+            if ordered:
+                queue.append(task)
+            return
+
+    try:
+        for _ in range(max_concurrency):
+            submit_next()
+        while pending:
+            if ordered:
+                task = queue.popleft()
+                await asyncio.wait([task])
+                done = [task]
+            else:
+                done = list((await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))[0])
+            for task in done:
+                index, operation = pending.pop(task)
+                submit_next()
+                yield _result(index, operation, task.exception(), task)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _result(index: int, operation: Any, error: Optional[BaseException], future: Any) -> BulkResult:
+    if error is None:
+        return BulkResult(index, operation, result=future.result())
+    if not isinstance(error, Exception):
+        raise error
+    return BulkResult(index, operation, error=error)
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+import unittest
+from timeular_bulk import run_bulk, run_bulk_async
+from typing import Any, Dict
+
+
+def call(operation: int) -> Dict[str, Any]:
+    if operation == 3:
+        raise ValueError("bad row")
+    time.sleep(0.001 * (5 - operation % 5))
+    return {"id": operation}
+
+
+class TestRunBulk(unittest.TestCase):
+
+    def test_partial_failure_does_not_abort(self) -> None:
+        results = list(run_bulk(call, range(10), max_workers=4))
+        self.assertEqual(sorted(r.index for r in results), list(range(10)))
+        failed = [r for r in results if not r.ok]
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0].operation, 3)
+        self.assertIsInstance(failed[0].error, ValueError)
+        self.assertEqual({r.result["id"] for r in results if r.ok}, set(range(10)) - {3})
+
+    def test_ordered(self) -> None:
+        results = list(run_bulk(call, range(10), max_workers=4, ordered=True))
+        self.assertEqual([r.index for r in results], list(range(10)))
+
+    def test_input_is_consumed_lazily(self) -> None:
+        consumed = 0
+        lock = threading.Lock()
+
+        def operations() -> Any:
+            nonlocal consumed
+            for i in range(1000):
+                with lock:
+                    consumed += 1
+                yield i
+
+        results = run_bulk(lambda op: {}, operations(), max_workers=2)
+        next(results)
+        self.assertLessEqual(consumed, 5)
+        results.close()
+
+
+class TestRunBulkAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def test_bounded_concurrency(self) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def acall(operation: int) -> Dict[str, Any]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            if operation == 3:
+                raise ValueError("bad row")
+            return {"id": operation}
+
+        results = [r async for r in run_bulk_async(acall, range(20), max_concurrency=3, ordered=True)]
+        self.assertEqual([r.index for r in results], list(range(20)))
+        self.assertEqual([r.index for r in results if not r.ok], [3])
+        self.assertEqual(peak, 3)
+
+if __name__ == '__main__':
+    unittest.main()
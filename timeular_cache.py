@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "/activities": 300.0,
+    "/tags": 300.0,
+    "/mentions": 300.0,
+    "/tracking": 5.0,
+}
+
+# Collections whose cached reads go stale when another collection changes:
+# stopping or editing the current tracking creates or changes time entries,
+# and archiving an activity can end the current tracking.
+RELATED_COLLECTIONS: Dict[str, Tuple[str, ...]] = {
+    "/tracking": ("/time-entries",),
+    "/activities": ("/tracking",),
+}
+
+
+def collection_of(endpoint: str) -> str:
+    return "/" + endpoint.lstrip("/").split("/", 1)[0]
+
+
+class _Entry:
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, body: bytes, etag: Optional[str], expires_at: float) -> None:
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class CacheLookup(NamedTuple):
+    body: Optional[bytes]
+    etag: Optional[str]
+    generation: int
+
+
+class ResponseCache:
+    """Read-through cache for GET endpoints with per-endpoint TTLs.
+
+    Bodies are kept as the raw JSON bytes so every hit decodes a fresh copy
+    that callers are free to mutate. Expired entries are kept (subject to
+    LRU eviction) so their ETag can be revalidated with If-None-Match.
+    Mutations invalidate their collection; a read that raced with a mutation
+    is not stored.
+
+    A cache holds one account's data and must not be shared between clients
+    signed in with different API keys.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        return self.ttls.get(endpoint)
+
+    def _generation(self, endpoint: str) -> int:
+        # Both counters only grow, so any invalidation changes the sum.
+        return self._epoch + self._generations.get(collection_of(endpoint), 0)
+
+    def lookup(self, endpoint: str) -> CacheLookup:
+        """Return the fresh body if there is one, else the ETag to revalidate with."""
+        with self._lock:
+            generation = self._generation(endpoint)
+            entry = self._entries.get(endpoint)
+            if entry is None:
+                return CacheLookup(None, None, generation)
+            self._entries.move_to_end(endpoint)
+            if entry.expires_at > self._clock():
+                return CacheLookup(entry.body, entry.etag, generation)
+            return CacheLookup(None, entry.etag, generation)
+
+    def store(self, endpoint: str, body: bytes, etag: Optional[str], generation: int) -> None:
+        ttl = self.ttl_for(endpoint)
+        if ttl is None:
+            return
+        with self._lock:
+            if self._generation(endpoint) != generation:
+                return
+            self._entries[endpoint] = _Entry(body, etag, self._clock() + ttl)
+            self._entries.move_to_end(endpoint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revalidate(self, endpoint: str) -> Optional[bytes]:
+        """Extend an entry after a 304 Not Modified and return its body."""
+        ttl = self.ttl_for(endpoint)
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is None or ttl is None:
+                return None
+            entry.expires_at = self._clock() + ttl
+            return entry.body
+
+    def invalidate(self, endpoint: str) -> None:
+        collection = collection_of(endpoint)
+        self._invalidate_collections((collection,) + RELATED_COLLECTIONS.get(collection, ()))
+
+    def _invalidate_collections(self, collections: Iterable[str]) -> None:
+        collections = set(collections)
+        with self._lock:
+            for collection in collections:
+                self._generations[collection] = self._generations.get(collection, 0) + 1
+            for key in [key for key in self._entries if collection_of(key) in collections]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
@@ -0,0 +1,64 @@
+import unittest
+from timeular_cache import ResponseCache, collection_of
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttls={"/tags": 10, "/tracking": 1, "/time-entries": 10}, max_entries=2, clock=self.clock)
+
+    def test_collection_of(self) -> None:
+        self.assertEqual(collection_of("/time-entries/42"), "/time-entries")
+        self.assertEqual(collection_of("/tags"), "/tags")
+
+    def test_ttl_and_etag_revalidation(self) -> None:
+        generation = self.cache.lookup("/tags").generation
+        self.cache.store("/tags", b'{"tags": []}', '"v1"', generation)
+        self.assertEqual(self.cache.lookup("/tags").body, b'{"tags": []}')
+        self.clock.now = 11
+        lookup = self.cache.lookup("/tags")
+        self.assertIsNone(lookup.body)
+        self.assertEqual(lookup.etag, '"v1"')
+        self.assertEqual(self.cache.revalidate("/tags"), b'{"tags": []}')
+        self.assertIsNotNone(self.cache.lookup("/tags").body)
+
+    def test_uncached_endpoints_are_not_stored(self) -> None:
+        self.cache.store("/mentions", b"{}", None, 0)
+        self.assertIsNone(self.cache.lookup("/mentions").body)
+
+    def test_lru_eviction(self) -> None:
+        for endpoint in ("/tags", "/tracking"):
+            self.cache.store(endpoint, b"{}", None, 0)
+        self.cache.lookup("/tags")
+        self.cache.store("/time-entries", b"{}", None, 0)
+        self.assertIsNotNone(self.cache.lookup("/tags").body)
+        self.assertIsNone(self.cache.lookup("/tracking").body)
+
+    def test_invalidation_covers_related_collections(self) -> None:
+        for endpoint in ("/tracking", "/time-entries"):
+            self.cache.store(endpoint, b"{}", None, 0)
+        self.cache.invalidate("/tracking/t1")
+        self.assertIsNone(self.cache.lookup("/tracking").body)
+        self.assertIsNone(self.cache.lookup("/time-entries").body)
+
+    def test_read_racing_a_mutation_is_not_stored(self) -> None:
+        generation = self.cache.lookup("/tags").generation
+        self.cache.invalidate("/tags/t1")
+        self.cache.store("/tags", b"{}", None, generation)
+        self.assertIsNone(self.cache.lookup("/tags").body)
+        generation = self.cache.lookup("/tags").generation
+        self.cache.clear()
+        self.cache.store("/tags", b"{}", None, generation)
+        self.assertIsNone(self.cache.lookup("/tags").body)
+
+if __name__ == '__main__':
+    unittest.main()
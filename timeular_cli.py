@@ -0,0 +1,194 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from timeular import BASE_URL, TimeularClient
+from timeular_models import TimeEntry
+
+COLUMNS = ("id", "activity_id", "started_at", "stopped_at", "duration_seconds", "note", "tags", "mentions")
+FORMATS = ("ndjson", "csv", "parquet")
+_SUFFIXES = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".parquet": "parquet"}
+
+
+def entry_row(entry: TimeEntry) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "activity_id": entry.activity_id,
+        "started_at": entry.started_at,
+        "stopped_at": entry.stopped_at,
+        "duration_seconds": entry.duration_seconds,
+        "note": entry.note,
+        "tags": list(entry.tags),
+        "mentions": list(entry.mentions),
+    }
+
+
+def _isoformat(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _flat(row: Dict[str, Any]) -> Dict[str, Any]:
+    # CSV and Parquet columns are scalar, so tags and mentions are stored as JSON text.
+    return dict(row, tags=json.dumps(row["tags"]), mentions=json.dumps(row["mentions"]))
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_ndjson(rows: Iterable[Dict[str, Any]], out: IO[str]) -> None:
+    for row in rows:
+        out.write(json.dumps(row, default=_isoformat))
+        out.write("\n")
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], out: IO[str]) -> None:
+    writer = csv.DictWriter(out, COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        row = _flat(row)
+        for column in ("started_at", "stopped_at"):
+            if row[column] is not None:
+                row[column] = row[column].isoformat()
+        writer.writerow(row)
+
+
+def write_parquet(rows: Iterable[Dict[str, Any]], path: str, chunk_size: int = 10000) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("activity_id", pa.string()),
+        ("started_at", pa.timestamp("ms", tz="UTC")),
+        ("stopped_at", pa.timestamp("ms", tz="UTC")),
+        ("duration_seconds", pa.float64()),
+        ("note", pa.string()),
+        ("tags", pa.string()),
+        ("mentions", pa.string()),
+    ])
+    with pq.ParquetWriter(path, schema) as writer:
+        # Each chunk becomes one row group, so only chunk_size rows are held in memory.
+        for chunk in chunked(rows, chunk_size):
+            flat = [_flat(row) for row in chunk]
+            writer.write_table(pa.Table.from_pylist(flat, schema=schema))
+
+
+class Progress:
+    """Single status line on a terminal, redrawn at most every ``interval`` seconds."""
+
+    def __init__(self, stream: IO[str], interval: float = 0.5) -> None:
+        self.stream = stream
+        self.interval = interval
+        self.count = 0
+        self._started = time.monotonic()
+        self._drawn = 0.0
+
+    def track(self, entries: Iterable[TimeEntry]) -> Iterator[TimeEntry]:
+        for entry in entries:
+            self.count += 1
+            now = time.monotonic()
+            if now - self._drawn >= self.interval:
+                self._drawn = now
+                day = entry.started_at.date().isoformat() if entry.started_at is not None else "?"
+                self._draw(f"{self.count} entries, through {day}")
+            yield entry
+        self._draw(f"{self.count} entries")
+        self.stream.write("\n")
+
+    def _draw(self, status: str) -> None:
+        rate = self.count / max(time.monotonic() - self._started, 1e-9)
+        self.stream.write(f"\r{status} ({rate:.0f}/s)\x1b[K")
+        self.stream.flush()
+
+
+def export(
+    client: TimeularClient,
+    start_date: str,
+    end_date: str,
+    output: str,
+    format: str,
+    shard_days: int = 30,
+    workers: int = 4,
+    chunk_size: int = 10000,
+    progress: Optional[Progress] = None,
+) -> int:
+    from timeular_reports import ReportEngine
+
+    engine = ReportEngine(client, shard=timedelta(days=shard_days), max_workers=workers)
+    entries: Iterable[TimeEntry] = engine.iter_time_entries(start_date, end_date)
+    if progress is not None:
+        entries = progress.track(entries)
+    count = 0
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry_row(entry)
+
+    if format == "parquet":
+        write_parquet(rows(), output, chunk_size)
+    elif output == "-":
+        (write_csv if format == "csv" else write_ndjson)(rows(), sys.stdout)
+    else:
+        with open(output, "w", newline="" if format == "csv" else None) as out:
+            (write_csv if format == "csv" else write_ndjson)(rows(), out)
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="timeular", description="Timeular API command-line tools.")
+    commands = parser.add_subparsers(dest="command")
+    command = commands.add_parser("export", help="export time entries for a date range")
+    command.add_argument("start_date", help="first day, YYYY-MM-DD")
+    command.add_argument("end_date", help="last day, YYYY-MM-DD")
+    command.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    command.add_argument("-f", "--format", choices=FORMATS, help="output format (default: from the file name, else ndjson)")
+    command.add_argument("--shard-days", type=int, default=30, help="days fetched per report request")
+    command.add_argument("--workers", type=int, default=4, help="report requests in flight")
+    command.add_argument("--chunk-size", type=int, default=10000, help="rows per Parquet row group")
+    command.add_argument("--progress", dest="progress", action="store_true", default=None, help="show progress on stderr (default: when it is a terminal)")
+    command.add_argument("--no-progress", dest="progress", action="store_false")
+    command.add_argument("--api-key", default=os.environ.get("TIMEULAR_API_KEY"))
+    command.add_argument("--api-secret", default=os.environ.get("TIMEULAR_API_SECRET"))
+    command.add_argument("--base-url", default=BASE_URL, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command != "export":
+        parser.print_help()
+        return 2
+    if not args.api_key or not args.api_secret:
+        parser.error("set TIMEULAR_API_KEY and TIMEULAR_API_SECRET, or pass --api-key and --api-secret")
+    format = args.format or _SUFFIXES.get(os.path.splitext(args.output)[1].lower(), "ndjson")
+    if format == "parquet" and args.output == "-":
+        parser.error("parquet output needs a file name")
+    show_progress = args.progress if args.progress is not None else sys.stderr.isatty()
+    with TimeularClient(args.api_key, args.api_secret, pool_maxsize=args.workers, base_url=args.base_url) as client:
+        export(
+            client, args.start_date, args.end_date, args.output, format,
+            args.shard_days, args.workers, args.chunk_size,
+            Progress(sys.stderr) if show_progress else None,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from timeular_cli import Progress, entry_row, main, write_csv, write_ndjson
+from timeular_mockserver import MockTimeularServer
+from timeular_models import TimeEntry
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+ENTRY = TimeEntry(
+    "1", "a1", datetime(2023, 1, 2, 9, tzinfo=timezone.utc), datetime(2023, 1, 2, 10, tzinfo=timezone.utc),
+    "standup", ({"id": 1, "label": "billable"},),
+)
+
+
+class TestWriters(unittest.TestCase):
+
+    def test_ndjson(self) -> None:
+        out = io.StringIO()
+        write_ndjson([entry_row(ENTRY)], out)
+        row = json.loads(out.getvalue())
+        self.assertEqual(row["started_at"], "2023-01-02T09:00:00+00:00")
+        self.assertEqual(row["duration_seconds"], 3600.0)
+        self.assertEqual(row["tags"], [{"id": 1, "label": "billable"}])
+
+    def test_csv(self) -> None:
+        out = io.StringIO()
+        write_csv([entry_row(ENTRY)], out)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(rows[0]["stopped_at"], "2023-01-02T10:00:00+00:00")
+        self.assertEqual(json.loads(rows[0]["tags"]), [{"id": 1, "label": "billable"}])
+
+    def test_progress(self) -> None:
+        out = io.StringIO()
+        self.assertEqual(list(Progress(out, interval=0).track([ENTRY, ENTRY])), [ENTRY, ENTRY])
+        self.assertIn("2 entries, through 2023-01-02", out.getvalue())
+        self.assertTrue(out.getvalue().endswith("\n"))
+
+
+class TestExportCommand(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = MockTimeularServer(entries=200).start()
+        self.addCleanup(self.server.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def run_export(self, output: str, *extra: str) -> str:
+        path = os.path.join(self.dir, output)
+        self.assertEqual(main([
+            "export", "2023-01-01", "2023-01-31", "-o", path, "--shard-days", "1", "--workers", "3",
+            "--api-key", "key", "--api-secret", "secret", "--base-url", self.server.url, "--no-progress", *extra,
+        ]), 0)
+        return path
+
+    def test_ndjson_export(self) -> None:
+        with open(self.run_export("entries.ndjson")) as f:
+            ids = [json.loads(line)["id"] for line in f]
+        self.assertEqual(ids, list(self.server.api.time_entries))
+
+    def test_csv_export(self) -> None:
+        with open(self.run_export("entries.txt", "--format", "csv"), newline="") as f:
+            self.assertEqual(len(list(csv.DictReader(f))), 200)
+
+    @unittest.skipIf(pq is None, "pyarrow is not installed")
+    def test_parquet_export(self) -> None:
+        table = pq.read_table(self.run_export("entries.parquet", "--chunk-size", "64"))
+        self.assertEqual(table.num_rows, 200)
+        self.assertEqual(pq.ParquetFile(os.path.join(self.dir, "entries.parquet")).num_row_groups, 4)
+
+    def test_missing_credentials(self) -> None:
+        with patch.dict(os.environ, {}, clear=True), patch("sys.stderr", io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(["export", "2023-01-01", "2023-01-31"])
+
+if __name__ == '__main__':
+    unittest.main()
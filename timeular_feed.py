@@ -0,0 +1,369 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from timeular import TimeularClient
+from timeular_json import loads
+from timeular_models import TimeEntry, Tracking
+
+if TYPE_CHECKING:
+    from timeular_async import AsyncTimeularClient
+
+TRACKING_STARTED = "tracking_started"
+TRACKING_STOPPED = "tracking_stopped"
+TRACKING_EDITED = "tracking_edited"
+ENTRY_CREATED = "entry_created"
+ENTRY_CHANGED = "entry_changed"
+ENTRY_DELETED = "entry_deleted"
+
+
+class ChangeEvent(NamedTuple):
+    """One change seen by a feed.
+
+    ``current`` is the Tracking or TimeEntry after the change and
+    ``previous`` the one before it; each is None where it doesn't exist
+    (``previous`` for starts and creations, ``current`` for stops and
+    deletions).
+    """
+
+    kind: str
+    id: str
+    current: Any = None
+    previous: Any = None
+
+
+Callback = Callable[[ChangeEvent], None]
+ErrorHandler = Callable[[BaseException], None]
+Request = Tuple[str, str, Optional[str], Dict[str, Any]]
+
+_UNCHANGED = object()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _item_digest(item: Any) -> bytes:
+    return _digest(json.dumps(item, sort_keys=True, separators=(",", ":")).encode())
+
+
+class _Snapshot:
+    """Last seen state of one endpoint: its ETag, a hash of the whole body and,
+    per item, a hash of its JSON plus its decoded model."""
+
+    __slots__ = ("etag", "digest", "items")
+
+    def __init__(self) -> None:
+        self.etag: Optional[str] = None
+        self.digest: Optional[bytes] = None
+        self.items: Dict[str, Tuple[bytes, Any]] = {}
+
+
+class _FeedState:
+    # Diffs successive bodies of /tracking and of the watched entries. A body
+    # whose hash matches the previous one is not decoded at all, and only
+    # items whose own hash changed are turned into events.
+
+    def __init__(self, emit_initial: bool, window: timedelta, full_history: bool, clock: Callable[[], datetime]) -> None:
+        self.tracking = _Snapshot()
+        self.entries = _Snapshot()
+        self.emit_initial = emit_initial
+        self.window = window
+        self.full_history = full_history
+        self.clock = clock
+        self._window_start: Optional[datetime] = None
+
+    def tracking_request(self) -> Request:
+        return "GET", "/tracking", self.tracking.etag, {}
+
+    def entries_request(self) -> Request:
+        if self.full_history:
+            return "GET", "/time-entries", self.entries.etag, {}
+        # Reports are POSTs, so they can't be conditional; the window keeps
+        # each poll down to recent entries instead.
+        now = self.clock()
+        start = (now - self.window).date()
+        self._window_start = datetime.combine(start, time(), tzinfo=timezone.utc)
+        return "POST", "/reports/time-entries", None, {"json": {"startDate": start.isoformat(), "endDate": now.date().isoformat()}}
+
+    def _decode(self, snapshot: _Snapshot, body: Optional[bytes], etag: Optional[str], key: str) -> Optional[Any]:
+        # Returns the value under ``key`` when the body differs from the last
+        # one seen, else the _UNCHANGED sentinel.
+        if body is None:  # 304 Not Modified
+            return _UNCHANGED
+        snapshot.etag = etag
+        digest = _digest(body)
+        if digest == snapshot.digest:
+            return _UNCHANGED
+        snapshot.digest = digest
+        return (loads(body) or {}).get(key)
+
+    def tracking_events(self, body: Optional[bytes], etag: Optional[str]) -> List[ChangeEvent]:
+        seeding = self.tracking.digest is None
+        data = self._decode(self.tracking, body, etag, "currentTracking")
+        if data is _UNCHANGED:
+            return []
+        previous = next(iter(self.tracking.items.values()), None)
+        current = (_item_digest(data), Tracking.from_dict(data)) if data else None
+        self.tracking.items = {current[1].id: current} if current else {}
+        if seeding and not self.emit_initial:
+            return []
+        events = []
+        if previous is not None and (current is None or current[1].id != previous[1].id):
+            events.append(ChangeEvent(TRACKING_STOPPED, previous[1].id, None, previous[1]))
+            previous = None
+        if current is not None:
+            if previous is None:
+                events.append(ChangeEvent(TRACKING_STARTED, current[1].id, current[1]))
+            elif current[0] != previous[0]:
+                events.append(ChangeEvent(TRACKING_EDITED, current[1].id, current[1], previous[1]))
+        return events
+
+    def entry_events(self, body: Optional[bytes], etag: Optional[str]) -> List[ChangeEvent]:
+        seeding = self.entries.digest is None
+        items = self._decode(self.entries, body, etag, "timeEntries")
+        if items is _UNCHANGED:
+            return []
+        previous = self.entries.items
+        current: Dict[str, Tuple[bytes, TimeEntry]] = {}
+        for item in items or ():
+            digest = _item_digest(item)
+            old = previous.get(str(item["id"]))
+            entry = old[1] if old is not None and old[0] == digest else TimeEntry.from_dict(item)
+            current[entry.id] = (digest, entry)
+        self.entries.items = current
+        if seeding and not self.emit_initial:
+            return []
+        events = []
+        for entry_id, (digest, entry) in current.items():
+            old = previous.get(entry_id)
+            if old is None:
+                events.append(ChangeEvent(ENTRY_CREATED, entry_id, entry))
+            elif old[0] != digest:
+                events.append(ChangeEvent(ENTRY_CHANGED, entry_id, entry, old[1]))
+        for entry_id, (_, entry) in previous.items():
+            if entry_id not in current and not self._aged_out(entry):
+                events.append(ChangeEvent(ENTRY_DELETED, entry_id, None, entry))
+        return events
+
+    def _aged_out(self, entry: TimeEntry) -> bool:
+        # An entry that stopped before the report window starts has slid out
+        # of it rather than been deleted; one still overlapping the window
+        # start would still be in the report.
+        window_start = self._window_start
+        return window_start is not None and entry.stopped_at is not None and entry.stopped_at < window_start
+
+
+def _deliver(callbacks: List[Callback], events: List[ChangeEvent], on_error: Optional[ErrorHandler]) -> None:
+    # Every callback sees every event even if another one raises: the feed's
+    # state has already moved past these events, so an undelivered one would
+    # be lost. Errors go to on_error, or without one the first is raised once
+    # the batch has been delivered.
+    first: Optional[Exception] = None
+    for event in events:
+        for callback in list(callbacks):
+            try:
+                callback(event)
+            except Exception as exc:
+                if on_error is not None:
+                    on_error(exc)
+                elif first is None:
+                    first = exc
+    if first is not None:
+        raise first
+
+
+class _Interval:
+    # Polls again after min_interval while things are changing and backs off
+    # by ``backoff`` per quiet poll, up to max_interval.
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("need 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.current = min_interval
+
+    def update(self, changed: bool) -> float:
+        if changed:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.max_interval, self.current * self.backoff)
+        return self.current
+
+    def failed(self) -> float:
+        self.current = self.max_interval
+        return self.current
+
+
+class TrackingFeed:
+    """Poll the current tracking (and optionally the time entries) and report what changed.
+
+    Entries are watched through a report covering the last ``window``; with
+    ``full_history`` the whole of /time-entries is fetched instead, which
+    also sees changes to older entries but grows with the account. Entries
+    leaving the window are not reported as deleted. GETs send the last ETag,
+    and a body whose hash is unchanged is not decoded; only a hash and the
+    decoded model of each item are kept.
+
+    The first poll only records the starting state unless ``emit_initial``
+    is set. ``poll`` runs one round in the calling thread; ``start`` polls
+    on a background thread, waiting ``min_interval`` after a change and
+    backing off to ``max_interval`` while nothing happens, and passes every
+    event to the subscribed callbacks.
+
+    Failed polls and exceptions raised by callbacks both go to ``on_error``;
+    a failing callback doesn't stop the others from receiving the event.
+    """
+
+    def __init__(
+        self,
+        client: TimeularClient,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        watch_entries: bool = True,
+        window: timedelta = timedelta(days=7),
+        full_history: bool = False,
+        emit_initial: bool = False,
+        on_error: Optional[ErrorHandler] = None,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self.client = client
+        self.watch_entries = watch_entries
+        self.on_error = on_error
+        self.interval = _Interval(min_interval, max_interval, backoff)
+        self._state = _FeedState(emit_initial, window, full_history, clock)
+        self._callbacks: List[Callback] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callback) -> Callable[[], None]:
+        """Call ``callback`` with every event; returns a function that unsubscribes it."""
+        self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    def poll(self) -> List[ChangeEvent]:
+        events = self._fetch()
+        _deliver(self._callbacks, events, self.on_error)
+        return events
+
+    def _fetch(self) -> List[ChangeEvent]:
+        state = self._state
+        method, endpoint, etag, kwargs = state.tracking_request()
+        events = state.tracking_events(*self.client._conditional_request(method, endpoint, etag, **kwargs))
+        if self.watch_entries:
+            method, endpoint, etag, kwargs = state.entries_request()
+            events += state.entry_events(*self.client._conditional_request(method, endpoint, etag, **kwargs))
+        return events
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="timeular-tracking-feed", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "TrackingFeed":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                events = self._fetch()
+            except Exception as exc:
+                delay = self.interval.failed()
+                if self.on_error is not None:
+                    self.on_error(exc)
+            else:
+                delay = self.interval.update(bool(events))
+                try:
+                    _deliver(self._callbacks, events, self.on_error)
+                except Exception:
+                    pass  # only raised without on_error, and there is no caller to raise to
+            self._stop.wait(delay)
+
+
+class AsyncTrackingFeed:
+    """asyncio counterpart of TrackingFeed; iterate over it to receive events.
+
+    ``async for event in feed`` polls with the same adaptive interval until
+    the loop is left.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncTimeularClient",
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        watch_entries: bool = True,
+        window: timedelta = timedelta(days=7),
+        full_history: bool = False,
+        emit_initial: bool = False,
+        on_error: Optional[ErrorHandler] = None,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self.client = client
+        self.watch_entries = watch_entries
+        self.on_error = on_error
+        self.interval = _Interval(min_interval, max_interval, backoff)
+        self._state = _FeedState(emit_initial, window, full_history, clock)
+        self._callbacks: List[Callback] = []
+
+    def subscribe(self, callback: Callback) -> Callable[[], None]:
+        self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    async def poll(self) -> List[ChangeEvent]:
+        events = await self._fetch()
+        _deliver(self._callbacks, events, self.on_error)
+        return events
+
+    async def _fetch(self) -> List[ChangeEvent]:
+        state = self._state
+        method, endpoint, etag, kwargs = state.tracking_request()
+        events = state.tracking_events(*await self.client._conditional_request(method, endpoint, etag, **kwargs))
+        if self.watch_entries:
+            method, endpoint, etag, kwargs = state.entries_request()
+            events += state.entry_events(*await self.client._conditional_request(method, endpoint, etag, **kwargs))
+        return events
+
+    async def __aiter__(self) -> AsyncIterator[ChangeEvent]:
+        import asyncio
+
+        while True:
+            try:
+                events = await self._fetch()
+            except Exception as exc:
+                if self.on_error is None:
+                    raise
+                self.on_error(exc)
+                await asyncio.sleep(self.interval.failed())
+                continue
+            callback_error: Optional[Exception] = None
+            try:
+                _deliver(self._callbacks, events, self.on_error)
+            except Exception as exc:
+                callback_error = exc
+            for event in events:
+                yield event
+            if callback_error is not None:
+                raise callback_error
+            await asyncio.sleep(self.interval.update(bool(events)))
@@ -0,0 +1,245 @@
+import json
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from timeular import TimeularClient
+from timeular_async import AsyncTimeularClient
+from timeular_feed import (
+    ENTRY_CHANGED, ENTRY_CREATED, ENTRY_DELETED, TRACKING_EDITED, TRACKING_STARTED, TRACKING_STOPPED,
+    AsyncTrackingFeed, ChangeEvent, TrackingFeed,
+)
+from timeular_models import TimeEntry, Tracking
+from timeular_transport import AsyncFakeTransport, FakeTimeularAPI, FakeTransport
+
+
+NOW = datetime(2023, 1, 2, 12, tzinfo=timezone.utc)
+
+
+class TestTrackingFeed(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = FakeTimeularAPI(clock=lambda: datetime(2023, 1, 2, 9))
+        self.activity = self.api.add_activity("Work")
+        self.client = TimeularClient("key", "secret", session=FakeTransport(self.api))
+        self.feed = TrackingFeed(self.client, clock=lambda: NOW)
+
+    def kinds(self, events: List[ChangeEvent]) -> List[str]:
+        return [event.kind for event in events]
+
+    def test_first_poll_is_baseline(self) -> None:
+        self.api.add_time_entry(self.activity["id"], "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+        self.assertEqual(self.feed.poll(), [])
+        self.assertEqual(self.feed.poll(), [])
+
+    def test_emit_initial(self) -> None:
+        entry = self.api.add_time_entry(self.activity["id"], "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+        feed = TrackingFeed(self.client, emit_initial=True, clock=lambda: NOW)
+        self.assertEqual(feed.poll(), [ChangeEvent(ENTRY_CREATED, entry["id"], TimeEntry.from_dict(entry))])
+
+    def test_watches_a_report_window(self) -> None:
+        old = self.api.add_time_entry(self.activity["id"], "2022-12-01T09:00:00.000", "2022-12-01T10:00:00.000")
+        self.feed.poll()
+        self.assertNotIn(old["id"], self.feed._state.entries.items)
+        with patch.object(self.client, "_send", wraps=self.client._send) as send:
+            self.feed.poll()
+        self.assertEqual(send.call_args_list[1].args, ("POST", "/reports/time-entries"))
+        self.assertEqual(send.call_args_list[1].kwargs["json"], {"startDate": "2022-12-26", "endDate": "2023-01-02"})
+
+    def test_entries_leaving_the_window_are_not_deleted(self) -> None:
+        self.api.add_time_entry(self.activity["id"], "2022-12-27T09:00:00.000", "2022-12-27T10:00:00.000")
+        now = [NOW]
+        feed = TrackingFeed(self.client, clock=lambda: now[0])
+        feed.poll()
+        now[0] += timedelta(days=2)
+        self.assertEqual(feed.poll(), [])
+        self.assertEqual(feed._state.entries.items, {})
+
+    def test_deleting_an_entry_overlapping_the_window_start(self) -> None:
+        overlapping = {
+            "id": "9", "activityId": "1",
+            "duration": {"startedAt": "2022-12-25T23:00:00.000", "stoppedAt": "2022-12-26T01:00:00.000"},
+        }
+        client = MagicMock()
+        client._conditional_request.side_effect = [
+            (b'{"currentTracking": null}', None),
+            (json.dumps({"timeEntries": [overlapping]}).encode(), None),
+            (b'{"currentTracking": null}', None),
+            (b'{"timeEntries": []}', None),
+        ]
+        feed = TrackingFeed(client, clock=lambda: NOW)
+        feed.poll()
+        self.assertEqual([(e.kind, e.id) for e in feed.poll()], [(ENTRY_DELETED, "9")])
+
+    def test_keeps_digests_and_models(self) -> None:
+        self.api.add_time_entry(self.activity["id"], "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+        self.feed.poll()
+        [(digest, entry)] = self.feed._state.entries.items.values()
+        self.assertEqual(len(digest), 16)
+        self.assertIsInstance(entry, TimeEntry)
+
+    def test_tracking_lifecycle(self) -> None:
+        self.feed.poll()
+        self.client.start_tracking(self.activity["id"])
+        events = self.feed.poll()
+        self.assertEqual(self.kinds(events), [TRACKING_STARTED])
+        self.assertIsInstance(events[0].current, Tracking)
+        self.assertIsNone(events[0].previous)
+
+        tracking_id = events[0].id
+        self.client.edit_tracking(tracking_id, "2023-01-02T08:30:00.000", "2023-01-02T10:00:00.000")
+        events = self.feed.poll()
+        self.assertEqual(self.kinds(events), [TRACKING_EDITED])
+        self.assertEqual(events[0].current.started_at, datetime(2023, 1, 2, 8, 30, tzinfo=timezone.utc))
+        self.assertEqual(events[0].previous.started_at, datetime(2023, 1, 2, 9, tzinfo=timezone.utc))
+
+        self.client.cancel_tracking()
+        events = self.feed.poll()
+        self.assertEqual(self.kinds(events), [TRACKING_STOPPED, ENTRY_CREATED])
+        self.assertEqual(events[0].id, tracking_id)
+        self.assertIsNone(events[0].current)
+        self.assertEqual(self.feed.poll(), [])
+
+    def test_entry_changes(self) -> None:
+        kept = self.api.add_time_entry(self.activity["id"], "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+        gone = self.api.add_time_entry(self.activity["id"], "2023-01-01T11:00:00.000", "2023-01-01T12:00:00.000")
+        self.feed.poll()
+        self.client.edit_time_entry(kept["id"], "2023-01-01T09:00:00.000", "2023-01-01T10:30:00.000")
+        self.client.delete_time_entry(gone["id"])
+        events = self.feed.poll()
+        self.assertEqual([(e.kind, e.id) for e in events], [(ENTRY_CHANGED, kept["id"]), (ENTRY_DELETED, gone["id"])])
+        self.assertEqual(events[0].current.stopped_at, datetime(2023, 1, 1, 10, 30, tzinfo=timezone.utc))
+        self.assertEqual(events[0].previous.stopped_at, datetime(2023, 1, 1, 10, tzinfo=timezone.utc))
+        self.assertIsNone(events[1].current)
+
+    def test_subscribe(self) -> None:
+        seen: List[ChangeEvent] = []
+        unsubscribe = self.feed.subscribe(seen.append)
+        self.feed.poll()
+        self.client.start_tracking(self.activity["id"])
+        self.feed.poll()
+        unsubscribe()
+        self.client.cancel_tracking()
+        self.feed.poll()
+        self.assertEqual(self.kinds(seen), [TRACKING_STARTED])
+
+    def test_failing_callback_does_not_lose_events(self) -> None:
+        errors: List[BaseException] = []
+        seen: List[str] = []
+        feed = TrackingFeed(self.client, on_error=errors.append, clock=lambda: NOW)
+
+        def broken(event: ChangeEvent) -> None:
+            raise RuntimeError(event.kind)
+
+        feed.subscribe(broken)
+        feed.subscribe(lambda event: seen.append(event.kind))
+        feed.poll()
+        self.client.start_tracking(self.activity["id"])
+        feed.poll()
+        self.client.cancel_tracking()
+        self.assertEqual(self.kinds(feed.poll()), [TRACKING_STOPPED, ENTRY_CREATED])
+        self.assertEqual(seen, [TRACKING_STARTED, TRACKING_STOPPED, ENTRY_CREATED])
+        self.assertEqual([str(e) for e in errors], seen)
+
+        feed.on_error = None
+        self.client.start_tracking(self.activity["id"])
+        with self.assertRaisesRegex(RuntimeError, TRACKING_STARTED):
+            feed.poll()
+        self.assertEqual(seen[-1], TRACKING_STARTED)
+
+    def test_background_callback_errors_keep_the_interval(self) -> None:
+        errors: List[BaseException] = []
+        feed = TrackingFeed(self.client, min_interval=0.01, max_interval=60, on_error=errors.append, clock=lambda: NOW)
+        feed.subscribe(lambda event: 1 / 0)
+        feed.poll()
+        self.client.start_tracking(self.activity["id"])
+        with patch.object(feed._stop, "wait", side_effect=lambda delay: feed._stop.set()) as wait:
+            feed._run()
+        wait.assert_called_once_with(0.01)
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+    def test_unchanged_body_is_not_decoded(self) -> None:
+        self.feed.poll()
+        with patch("timeular_feed.loads") as loads:
+            self.assertEqual(self.feed.poll(), [])
+        loads.assert_not_called()
+
+    def test_full_history_not_modified(self) -> None:
+        client = MagicMock()
+        client._conditional_request.side_effect = [
+            (b'{"currentTracking": null}', '"t1"'),
+            (b'{"timeEntries": []}', '"e1"'),
+            (None, '"t1"'),
+            (None, '"e1"'),
+        ]
+        feed = TrackingFeed(client, full_history=True)
+        feed.poll()
+        self.assertEqual(feed.poll(), [])
+        self.assertEqual(client._conditional_request.call_args_list[2].args, ("GET", "/tracking", '"t1"'))
+        self.assertEqual(client._conditional_request.call_args_list[3].args, ("GET", "/time-entries", '"e1"'))
+
+    def test_full_history_sees_old_entries(self) -> None:
+        old = self.api.add_time_entry(self.activity["id"], "2020-01-01T09:00:00.000", "2020-01-01T10:00:00.000")
+        feed = TrackingFeed(self.client, full_history=True, clock=lambda: NOW)
+        feed.poll()
+        self.client.delete_time_entry(old["id"])
+        self.assertEqual(self.kinds(feed.poll()), [ENTRY_DELETED])
+
+    def test_conditional_request_sends_etag(self) -> None:
+        response = MagicMock(status_code=304)
+        with patch("requests.Session.request", return_value=response) as request, \
+                patch("requests.Session.post") as post:
+            post.return_value.json.return_value = {"token": "t"}
+            client = TimeularClient("key", "secret")
+            self.assertEqual(client._conditional_request("GET", "/tracking", '"abc"'), (None, '"abc"'))
+        self.assertEqual(request.call_args.kwargs["headers"]["If-None-Match"], '"abc"')
+
+    def test_interval_adapts(self) -> None:
+        feed = TrackingFeed(self.client, min_interval=1.0, max_interval=4.0, backoff=2.0)
+        self.assertEqual([feed.interval.update(False) for _ in range(3)], [2.0, 4.0, 4.0])
+        self.assertEqual(feed.interval.update(True), 1.0)
+        self.assertEqual(feed.interval.failed(), 4.0)
+        with self.assertRaises(ValueError):
+            TrackingFeed(self.client, min_interval=5.0, max_interval=1.0)
+
+    def test_background_polling(self) -> None:
+        started = threading.Event()
+        feed = TrackingFeed(self.client, min_interval=0.01, max_interval=0.02, clock=lambda: NOW)
+        feed.subscribe(lambda event: started.set())
+        with feed:
+            self.client.start_tracking(self.activity["id"])
+            self.assertTrue(started.wait(2))
+
+    def test_background_errors(self) -> None:
+        errors: List[BaseException] = []
+        failed = threading.Event()
+        client = MagicMock()
+        client._conditional_request.side_effect = RuntimeError("down")
+        feed = TrackingFeed(client, min_interval=0.01, max_interval=0.01, on_error=lambda exc: (errors.append(exc), failed.set()))
+        with feed:
+            self.assertTrue(failed.wait(2))
+        self.assertIsInstance(errors[0], RuntimeError)
+
+
+class TestAsyncTrackingFeed(unittest.IsolatedAsyncioTestCase):
+
+    async def test_iterate(self) -> None:
+        api = FakeTimeularAPI(clock=lambda: datetime(2023, 1, 2, 9))
+        activity = api.add_activity("Work")
+        async with AsyncTimeularClient("key", "secret", session=AsyncFakeTransport(api)) as client:
+            feed = AsyncTrackingFeed(client, min_interval=0.001, max_interval=0.002, clock=lambda: NOW)
+            self.assertEqual(await feed.poll(), [])
+            await client.start_tracking(activity["id"])
+            events = feed.__aiter__()
+            event = await events.__anext__()
+            self.assertEqual(event.kind, TRACKING_STARTED)
+            await client.cancel_tracking()
+            self.assertEqual((await events.__anext__()).kind, TRACKING_STOPPED)
+            self.assertEqual((await events.__anext__()).kind, ENTRY_CREATED)
+            await events.aclose()
+
+
+if __name__ == '__main__':
+    unittest.main()
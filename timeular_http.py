@@ -0,0 +1,56 @@
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from timeular import Timeout
+
+# Session.request forwards a missing timeout as None, so an explicit
+# ``timeout=None`` is passed down as this instead to turn the default off.
+_NO_TIMEOUT: Any = object()
+
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests that don't set one."""
+
+    def __init__(self, timeout: Optional[Timeout] = None, **kwargs: Any) -> None:
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        timeout = kwargs.get("timeout")
+        if timeout is None:
+            kwargs["timeout"] = self.timeout
+        elif timeout is _NO_TIMEOUT:
+            kwargs["timeout"] = None
+        return super().send(request, **kwargs)
+
+
+class _Session(requests.Session):
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        if "timeout" in kwargs and kwargs["timeout"] is None:
+            kwargs["timeout"] = _NO_TIMEOUT
+        return super().request(method, url, *args, **kwargs)
+
+
+def create_session(
+    pool_connections: int,
+    pool_maxsize: int,
+    pool_block: bool,
+    keep_alive: bool,
+    timeout: Optional[Timeout],
+) -> requests.Session:
+    # pool_connections is the number of per-host pools kept around,
+    # pool_maxsize the number of sockets kept open to each host.
+    adapter = _PooledHTTPAdapter(
+        timeout=timeout,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session = _Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
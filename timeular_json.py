@@ -0,0 +1,167 @@
+import codecs
+import json
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson is the slowest import here, so it is only imported on first use.
+_NOT_LOADED: Any = object()
+ijson: Any = _NOT_LOADED
+
+loads: Callable[[Any], Any] = orjson.loads if orjson is not None else json.loads
+
+
+def _load_ijson() -> Any:
+    global ijson
+    if ijson is _NOT_LOADED:
+        try:
+            import ijson as module
+        except ImportError:
+            module = None
+        ijson = module
+    return ijson
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+_decoder = json.JSONDecoder()
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+class ArrayItemParser:
+    """Push parser yielding the items of one JSON array as the body arrives.
+
+    ``key`` names the member of the top-level object that holds the array;
+    with ``key=None`` the document itself must be the array. Each item is
+    decoded as soon as it is complete, so only the current item has to be
+    buffered. Anything after the array is ignored.
+    """
+
+    def __init__(self, key: Optional[str]) -> None:
+        self.key = key
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._final = False
+        self._state = "document" if key is not None else "array"
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += self._text.decode(chunk)
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        self._buffer += self._text.decode(b"", final=True)
+        self._final = True
+        items = self._drain()
+        if self._state != "done":
+            raise ValueError("truncated JSON document")
+        return items
+
+    def _drain(self) -> List[Any]:
+        items: List[Any] = []
+        try:
+            while self._state != "done":
+                self._step(items)
+        except _NeedMoreData:
+            if self._final:
+                raise ValueError("truncated JSON document") from None
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        return items
+
+    def _skip(self, pos: int) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos == len(self._buffer):
+            raise _NeedMoreData()
+        return pos
+
+    def _expect(self, pos: int, char: str) -> int:
+        pos = self._skip(pos)
+        if self._buffer[pos] != char:
+            raise ValueError(f"expected {char!r} at offset {pos} of the buffered JSON")
+        return pos + 1
+
+    def _value(self, pos: int) -> Any:
+        pos = self._skip(pos)
+        try:
+            value, end = _decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            raise _NeedMoreData() from None
+        # A number is only known to be complete once a delimiter follows it:
+        # "4." or "12" at the end of a chunk may continue in the next one.
+        if not self._final and (end == len(self._buffer) or self._buffer[end] not in _DELIMITERS):
+            raise _NeedMoreData()
+        return value, end
+
+    def _step(self, items: List[Any]) -> None:
+        # Each step either consumes a whole token sequence or, by raising
+        # _NeedMoreData, leaves self._pos where it was.
+        if self._state == "document":
+            self._pos = self._expect(self._pos, "{")
+            self._state = "first_member"
+        elif self._state in ("first_member", "member"):
+            pos = self._skip(self._pos)
+            if self._buffer[pos] == "}":
+                self._pos = pos + 1
+                self._state = "done"
+                return
+            if self._state == "member":
+                pos = self._expect(pos, ",")
+            name, pos = self._value(pos)
+            pos = self._expect(pos, ":")
+            if name == self.key:
+                pos = self._skip(pos)
+                if self._buffer.startswith("null", pos):
+                    self._pos = pos + 4
+                    self._state = "member"
+                    return
+                if "null".startswith(self._buffer[pos:pos + 4]):
+                    raise _NeedMoreData()
+                self._pos = self._expect(pos, "[")
+                self._state = "first_item"
+                return
+            _, self._pos = self._value(pos)
+            self._state = "member"
+        elif self._state == "array":
+            self._pos = self._expect(self._pos, "[")
+            self._state = "first_item"
+        else:
+            pos = self._skip(self._pos)
+            if self._buffer[pos] == "]":
+                self._pos = pos + 1
+                self._state = "done"
+                return
+            if self._state == "item":
+                pos = self._expect(pos, ",")
+            item, self._pos = self._value(pos)
+            items.append(item)
+            self._state = "item"
+
+
+def iter_array_items(chunks: Iterable[bytes], key: Optional[str]) -> Iterator[Any]:
+    """Yield the items of the array at ``key`` from an iterable of body chunks.
+
+    Uses ijson's C backend when it is installed, and ArrayItemParser
+    otherwise.
+    """
+    backend = _load_ijson()
+    if backend is not None:
+        events = backend.sendable_list()
+        coroutine = backend.items_coro(events, f"{key}.item" if key is not None else "item", use_float=True)
+        for chunk in chunks:
+            coroutine.send(chunk)
+            yield from events
+            del events[:]
+        coroutine.close()
+        yield from events
+        return
+    parser = ArrayItemParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,67 @@
+import json
+import unittest
+from unittest.mock import patch
+import timeular_json
+from timeular_json import ArrayItemParser, iter_array_items
+from typing import Any, List, Optional
+
+DOCUMENT = json.dumps({
+    "meta": {"note": "has \"timeEntries\": [\"decoy\"] inside", "n": [1, 2.5]},
+    "timeEntries": [{"id": "1", "note": {"text": "café ☃"}}, {"id": "2", "tags": []}, 3, 4.5, None, True],
+    "after": 1,
+}, ensure_ascii=False).encode("utf-8")
+EXPECTED = [{"id": "1", "note": {"text": "café ☃"}}, {"id": "2", "tags": []}, 3, 4.5, None, True]
+NULL_DOCUMENT = b'{"timeEntries": null, "after": [1]}'
+
+
+def split(data: bytes, size: int) -> List[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def parse(chunks: List[bytes], key: Optional[str]) -> List[Any]:
+    parser = ArrayItemParser(key)
+    items: List[Any] = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return items
+
+
+class TestArrayItemParser(unittest.TestCase):
+
+    def test_every_chunk_size(self) -> None:
+        for size in range(1, len(DOCUMENT) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(parse(split(DOCUMENT, size), "timeEntries"), EXPECTED)
+        for size in range(1, len(NULL_DOCUMENT) + 1):
+            with self.subTest(document="null", size=size):
+                self.assertEqual(parse(split(NULL_DOCUMENT, size), "timeEntries"), [])
+
+    def test_items_are_yielded_before_the_document_ends(self) -> None:
+        parser = ArrayItemParser("timeEntries")
+        self.assertEqual(parser.feed(b'{"timeEntries": [{"id": 1}, {"id"'), [{"id": 1}])
+        self.assertEqual(parser.feed(b': 2}]}'), [{"id": 2}])
+
+    def test_top_level_array_and_missing_key(self) -> None:
+        self.assertEqual(parse([b" [1, 2 ,3] "], None), [1, 2, 3])
+        self.assertEqual(parse([b'{"other": []}'], "timeEntries"), [])
+        self.assertEqual(parse([b'{"timeEntries": null}'], "timeEntries"), [])
+
+    def test_truncated_document(self) -> None:
+        with self.assertRaises(ValueError):
+            parse([b'{"timeEntries": [{"id": 1}, {"id"'], "timeEntries")
+        with self.assertRaises(ValueError):
+            parse([b'{"timeEntries": [1, 2'], "timeEntries")
+
+
+class TestIterArrayItems(unittest.TestCase):
+
+    def test_backends_agree(self) -> None:
+        chunks = split(DOCUMENT, 7)
+        with patch.object(timeular_json, "ijson", None):
+            self.assertEqual(list(iter_array_items(chunks, "timeEntries")), EXPECTED)
+        if timeular_json._load_ijson() is not None:
+            self.assertEqual(list(iter_array_items(chunks, "timeEntries")), EXPECTED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_ROUTE = re.compile(r"^/(activities|time-entries|tracking|tags|mentions)/[^/]+$")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Collapse ids in an endpoint path, e.g. ``/time-entries/42`` to ``/time-entries/{id}``."""
+    return _ID_ROUTE.sub(r"/\1/{id}", endpoint)
+
+
+class RequestEvent:
+    """One HTTP exchange, passed to pre-request hooks before it is sent and
+    to post-request hooks once it has completed or failed.
+
+    ``attempt`` is 0 for the first try and counts up on retries. ``status``
+    is None when the request raised, in which case ``error`` is set.
+    """
+
+    __slots__ = ("method", "endpoint", "attempt", "status", "elapsed", "request_bytes", "response_bytes", "error")
+
+    def __init__(self, method: str, endpoint: str, attempt: int = 0) -> None:
+        self.method = method
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.status: Optional[int] = None
+        self.elapsed = 0.0
+        self.request_bytes = 0
+        self.response_bytes: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+    @property
+    def template(self) -> str:
+        return endpoint_template(self.endpoint)
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+def run_hooks(hooks: List[Hook], event: RequestEvent) -> None:
+    for hook in hooks:
+        hook(event)
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "total", "errors", "retries", "request_bytes", "response_bytes")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.total = 0.0
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class Metrics:
+    """Built-in post-request hook collecting per-endpoint statistics.
+
+    Series are keyed by method and endpoint template, and record a latency
+    histogram, request/response byte counts, retries and errors (HTTP
+    statuses >= 400, or ``exception`` for requests that raised).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        self.observe(event)
+
+    def observe(self, event: RequestEvent) -> None:
+        key = (event.method, event.template)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            series.count += 1
+            series.total += event.elapsed
+            for index, bound in enumerate(self.buckets):
+                if event.elapsed <= bound:
+                    series.buckets[index] += 1
+                    break
+            if event.attempt:
+                series.retries += 1
+            series.request_bytes += event.request_bytes
+            series.response_bytes += event.response_bytes or 0
+            if event.error is not None:
+                series.errors["exception"] = series.errors.get("exception", 0) + 1
+            elif event.status is not None and event.status >= 400:
+                status = str(event.status)
+                series.errors[status] = series.errors.get(status, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot keyed by ``"METHOD /template"``; bucket counts are cumulative."""
+        with self._lock:
+            snapshot: Dict[str, Dict[str, Any]] = {}
+            for (method, template), series in sorted(self._series.items()):
+                cumulative = 0
+                buckets: Dict[str, int] = {}
+                for bound, count in zip(self.buckets, series.buckets):
+                    cumulative += count
+                    buckets[repr(bound)] = cumulative
+                buckets["+Inf"] = series.count
+                snapshot[f"{method} {template}"] = {
+                    "method": method,
+                    "endpoint": template,
+                    "count": series.count,
+                    "latency_sum": series.total,
+                    "latency_buckets": buckets,
+                    "retries": series.retries,
+                    "errors": dict(series.errors),
+                    "request_bytes": series.request_bytes,
+                    "response_bytes": series.response_bytes,
+                }
+            return snapshot
+
+    def to_prometheus(self, prefix: str = "timeular_client") -> str:
+        """Render the statistics in the Prometheus text exposition format."""
+        snapshot = self.to_dict()
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Latency of Timeular API requests.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for series in snapshot.values():
+            labels = f'method="{series["method"]}",endpoint="{series["endpoint"]}"'
+            for bound, count in series["latency_buckets"].items():
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {series['latency_sum']}")
+            lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {series['count']}")
+        counters = [
+            ("retries_total", "Retried Timeular API requests.", "retries"),
+            ("request_bytes_total", "Bytes sent in Timeular API request bodies.", "request_bytes"),
+            ("response_bytes_total", "Bytes received in Timeular API response bodies.", "response_bytes"),
+        ]
+        for name, help_text, field in counters:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for series in snapshot.values():
+                labels = f'method="{series["method"]}",endpoint="{series["endpoint"]}"'
+                lines.append(f"{prefix}_{name}{{{labels}}} {series[field]}")
+        lines.append(f"# HELP {prefix}_request_errors_total Failed Timeular API requests by status.")
+        lines.append(f"# TYPE {prefix}_request_errors_total counter")
+        for series in snapshot.values():
+            labels = f'method="{series["method"]}",endpoint="{series["endpoint"]}"'
+            for status, count in sorted(series["errors"].items()):
+                lines.append(f'{prefix}_request_errors_total{{{labels},status="{status}"}} {count}')
+        return "\n".join(lines) + "\n"
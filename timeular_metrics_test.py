@@ -0,0 +1,56 @@
+import unittest
+from timeular_metrics import Metrics, RequestEvent, endpoint_template
+
+
+def event(method: str, endpoint: str, elapsed: float, status: int = 200, attempt: int = 0) -> RequestEvent:
+    result = RequestEvent(method, endpoint, attempt)
+    result.status = status
+    result.elapsed = elapsed
+    result.request_bytes = 10
+    result.response_bytes = 100
+    return result
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_endpoint_template(self) -> None:
+        self.assertEqual(endpoint_template("/time-entries/42"), "/time-entries/{id}")
+        self.assertEqual(endpoint_template("/tracking/t1"), "/tracking/{id}")
+        self.assertEqual(endpoint_template("/tracking"), "/tracking")
+        self.assertEqual(endpoint_template("/reports/time-entries"), "/reports/time-entries")
+
+    def test_to_dict(self) -> None:
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics(event("GET", "/time-entries/1", 0.05))
+        metrics(event("GET", "/time-entries/2", 0.5, status=503))
+        metrics(event("GET", "/time-entries/2", 2.0, attempt=1))
+        failed = RequestEvent("GET", "/tags")
+        failed.error = ConnectionError()
+        metrics(failed)
+
+        stats = metrics.to_dict()
+        self.assertEqual(set(stats), {"GET /time-entries/{id}", "GET /tags"})
+        series = stats["GET /time-entries/{id}"]
+        self.assertEqual(series["count"], 3)
+        self.assertEqual(series["latency_sum"], 2.55)
+        self.assertEqual(series["latency_buckets"], {"0.1": 1, "1.0": 2, "+Inf": 3})
+        self.assertEqual(series["retries"], 1)
+        self.assertEqual(series["errors"], {"503": 1})
+        self.assertEqual((series["request_bytes"], series["response_bytes"]), (30, 300))
+        self.assertEqual(stats["GET /tags"]["errors"], {"exception": 1})
+
+        metrics.reset()
+        self.assertEqual(metrics.to_dict(), {})
+
+    def test_to_prometheus(self) -> None:
+        metrics = Metrics(buckets=(0.1,))
+        metrics(event("PATCH", "/tags/1", 0.05, status=404))
+        text = metrics.to_prometheus()
+        self.assertIn('# TYPE timeular_client_request_duration_seconds histogram', text)
+        self.assertIn('timeular_client_request_duration_seconds_bucket{method="PATCH",endpoint="/tags/{id}",le="0.1"} 1', text)
+        self.assertIn('timeular_client_request_duration_seconds_count{method="PATCH",endpoint="/tags/{id}"} 1', text)
+        self.assertIn('timeular_client_request_errors_total{method="PATCH",endpoint="/tags/{id}",status="404"} 1', text)
+        self.assertIn('timeular_client_response_bytes_total{method="PATCH",endpoint="/tags/{id}"} 100', text)
+
+if __name__ == '__main__':
+    unittest.main()
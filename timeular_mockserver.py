@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from timeular_transport import FakeTimeularAPI
+
+API_ROOT = "/api/v4"
+
+
+def populate(api: FakeTimeularAPI, count: int, note_size: int = 32, start: Optional[datetime] = None) -> None:
+    """Give ``api`` ten activities and ``count`` half-hourly time entries spread over them."""
+    start = start or datetime(2023, 1, 1, tzinfo=timezone.utc)
+    note = "x" * note_size
+    activities = [api.add_activity(f"Activity {i}")["id"] for i in range(1, 11)]
+    for i in range(count):
+        started = start + timedelta(minutes=30 * i)
+        api.add_time_entry(
+            activities[i % 10],
+            started.strftime("%Y-%m-%dT%H:%M:%S.000"),
+            (started + timedelta(minutes=25)).strftime("%Y-%m-%dT%H:%M:%S.000"),
+            note,
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, headers, payload = self.server.mock.respond(self.command, self.path, self.headers, body)
+        data = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    mock: "MockTimeularServer"
+
+
+class MockTimeularServer:
+    """Serves a FakeTimeularAPI over real HTTP, used by timeular_bench.
+
+    Without ``api`` a new one is filled with ``entries`` time entries. On top
+    of the fake API the server can add ``latency`` to every response and
+    answer every ``throttle_every``-th request with 429.
+    """
+
+    def __init__(
+        self,
+        entries: int = 100,
+        note_size: int = 32,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        retry_after: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api: Optional[FakeTimeularAPI] = None,
+    ) -> None:
+        if api is None:
+            api = FakeTimeularAPI()
+            populate(api, entries, note_size)
+        self.api = api
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_ROOT}"
+
+    def start(self) -> "MockTimeularServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockTimeularServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def respond(self, method: str, path: str, headers: Any, body: Any) -> Tuple[int, Dict[str, str], Any]:
+        path = urlsplit(path).path
+        with self._lock:
+            self.requests += 1
+            # Sign-in is never throttled; the clients don't retry it.
+            throttle = self.throttle_every and self.requests % self.throttle_every == 0 and not path.endswith("/sign-in")
+            if throttle:
+                self.throttled += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            return 429, {"Retry-After": str(self.retry_after)}, {"message": "Too Many Requests"}
+        if not path.startswith(API_ROOT + "/"):
+            return 404, {}, {"message": "Not Found"}
+        status, payload = self.api.handle(method, path[len(API_ROOT):], headers, body)
+        return status, {}, payload
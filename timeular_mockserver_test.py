@@ -0,0 +1,42 @@
+import unittest
+
+import requests
+
+from timeular import TimeularClient
+from timeular_mockserver import MockTimeularServer
+from timeular_transport import FakeTimeularAPI
+
+
+class TestMockTimeularServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = MockTimeularServer(entries=3, note_size=4, throttle_every=2).start()
+        self.addCleanup(self.server.stop)
+        self.client = TimeularClient("key", "secret", base_url=self.server.url)
+        self.addCleanup(self.client.close)
+
+    def test_serves_time_entries_and_throttles(self) -> None:
+        entries = self.client.get_time_entries()["timeEntries"]
+        self.assertEqual([e["id"] for e in entries], list(self.server.api.time_entries))
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[0]["note"]["text"], "xxxx")
+        # sign-in, a throttled GET and its retry
+        self.assertEqual((self.server.requests, self.server.throttled), (3, 1))
+
+    def test_edit_time_entry(self) -> None:
+        entry_id = next(iter(self.server.api.time_entries))
+        entry = self.client.edit_time_entry(entry_id, "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+        self.assertEqual(entry["id"], entry_id)
+        self.assertEqual(self.server.api.time_entries[entry_id]["duration"]["stoppedAt"], "2023-01-01T10:00:00.000")
+
+    def test_serves_a_given_fake_api(self) -> None:
+        api = FakeTimeularAPI(credentials={"key": "secret"})
+        api.add_activity("Work")
+        with MockTimeularServer(api=api) as server, TimeularClient("key", "secret", base_url=server.url) as client:
+            client.start_tracking("1")
+            self.assertEqual(api.current_tracking["activityId"], "1")
+            with TimeularClient("key", "wrong", base_url=server.url) as wrong, self.assertRaises(requests.HTTPError):
+                wrong.get_activities()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple, Type
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Timeular timestamp such as ``2017-01-01T00:00:00.000``.
+
+    Timeular sends UTC timestamps without an offset, so naive values are
+    returned as aware UTC datetimes.
+    """
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class Model(ABC):
+    """Base class for the slotted API models; subclasses list their fields in __slots__."""
+
+    __slots__ = ()
+    fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.fields = cls.fields + tuple(cls.__dict__.get("__slots__", ()))
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Any:
+        ...
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in ((name, getattr(self, name)) for name in self.fields)
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.fields)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class Activity(Model):
+    __slots__ = ("id", "name", "color", "integration", "space_id")
+
+    def __init__(
+        self,
+        id: str,
+        name: Optional[str],
+        color: Optional[str] = None,
+        integration: Optional[str] = None,
+        space_id: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.color = color
+        self.integration = integration
+        self.space_id = space_id
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Activity":
+        return cls(
+            id=str(data["id"]),
+            name=data.get("name"),
+            color=data.get("color"),
+            integration=data.get("integration"),
+            space_id=data.get("spaceId"),
+        )
+
+
+class Tag(Model):
+    __slots__ = ("id", "label", "key", "scope", "space_id")
+
+    def __init__(
+        self,
+        id: str,
+        label: Optional[str],
+        key: Optional[str] = None,
+        scope: Optional[str] = None,
+        space_id: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.label = label
+        self.key = key
+        self.scope = scope
+        self.space_id = space_id
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Tag":
+        return cls(
+            id=str(data["id"]),
+            label=data.get("label"),
+            key=data.get("key"),
+            scope=data.get("scope"),
+            space_id=data.get("spaceId"),
+        )
+
+
+class Mention(Tag):
+    __slots__ = ()
+
+
+class Tracking(Model):
+    __slots__ = ("id", "activity_id", "started_at", "note")
+
+    def __init__(
+        self,
+        id: Optional[str],
+        activity_id: Optional[str],
+        started_at: Optional[datetime],
+        note: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.activity_id = activity_id
+        self.started_at = started_at
+        self.note = note
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Tracking":
+        note = data.get("note")
+        return cls(
+            id=str(data["id"]) if data.get("id") is not None else None,
+            activity_id=data.get("activityId") or (data.get("activity") or {}).get("id"),
+            started_at=parse_timestamp(data.get("startedAt")),
+            note=note.get("text") if isinstance(note, dict) else note,
+        )
+
+
+class TimeEntry(Model):
+    __slots__ = ("id", "activity_id", "started_at", "stopped_at", "note", "tags", "mentions")
+
+    def __init__(
+        self,
+        id: str,
+        activity_id: Optional[str],
+        started_at: Optional[datetime],
+        stopped_at: Optional[datetime],
+        note: Optional[str] = None,
+        tags: Tuple[Any, ...] = (),
+        mentions: Tuple[Any, ...] = (),
+    ) -> None:
+        self.id = id
+        self.activity_id = activity_id
+        self.started_at = started_at
+        self.stopped_at = stopped_at
+        self.note = note
+        self.tags = tags
+        self.mentions = mentions
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimeEntry":
+        # The API nests start/stop under "duration" and tags/mentions under
+        # "note"; flat payloads are accepted too.
+        duration = data.get("duration") or data
+        note = data.get("note")
+        if not isinstance(note, dict):
+            note = {"text": note}
+        return cls(
+            id=str(data["id"]),
+            activity_id=data.get("activityId"),
+            started_at=parse_timestamp(duration.get("startedAt")),
+            stopped_at=parse_timestamp(duration.get("stoppedAt")),
+            note=note.get("text"),
+            tags=tuple(note.get("tags") or ()),
+            mentions=tuple(note.get("mentions") or ()),
+        )
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.stopped_at is None:
+            return None
+        return (self.stopped_at - self.started_at).total_seconds()
+
+
+MODELS_BY_KEY: Dict[str, Type[Model]] = {
+    "activities": Activity,
+    "activity": Activity,
+    "timeEntries": TimeEntry,
+    "timeEntry": TimeEntry,
+    "tags": Tag,
+    "tag": Tag,
+    "mentions": Mention,
+    "mention": Mention,
+    "currentTracking": Tracking,
+    "tracking": Tracking,
+}
+
+
+def to_model(model: Type[Model], data: Any) -> Any:
+    return data if isinstance(data, model) else model.from_dict(data)
+
+
+def convert_payload(payload: Any) -> Any:
+    """Replace the known entities of a response envelope with model objects.
+
+    ``{"activities": [{...}]}`` becomes ``{"activities": [Activity(...)]}``;
+    unknown keys and non-dict payloads are returned unchanged.
+    """
+    if not isinstance(payload, dict):
+        return payload
+    converted = dict(payload)
+    for key, value in payload.items():
+        model = MODELS_BY_KEY.get(key)
+        if model is None or value is None:
+            continue
+        if isinstance(value, list):
+            converted[key] = [to_model(model, item) for item in value]
+        elif isinstance(value, dict):
+            converted[key] = to_model(model, value)
+    return converted
@@ -0,0 +1,57 @@
+import unittest
+from datetime import datetime, timezone
+from timeular_models import Activity, Mention, Tag, TimeEntry, Tracking, convert_payload, parse_timestamp
+
+
+class TestModels(unittest.TestCase):
+
+    def test_parse_timestamp(self) -> None:
+        expected = datetime(2023, 1, 1, 9, 30, tzinfo=timezone.utc)
+        self.assertEqual(parse_timestamp("2023-01-01T09:30:00.000"), expected)
+        self.assertEqual(parse_timestamp("2023-01-01T09:30:00Z"), expected)
+        self.assertIsNone(parse_timestamp(None))
+
+    def test_time_entry_from_dict(self) -> None:
+        entry = TimeEntry.from_dict({
+            "id": 42,
+            "activityId": "a1",
+            "duration": {"startedAt": "2023-01-01T09:00:00.000", "stoppedAt": "2023-01-01T10:30:00.000"},
+            "note": {"text": "standup", "tags": [{"id": 1}], "mentions": []},
+        })
+        self.assertEqual(entry.id, "42")
+        self.assertEqual(entry.activity_id, "a1")
+        self.assertEqual(entry.duration_seconds, 5400.0)
+        self.assertEqual(entry.note, "standup")
+        self.assertEqual(entry.tags, ({"id": 1},))
+        self.assertFalse(hasattr(entry, "__dict__"))
+
+    def test_time_entry_from_flat_dict(self) -> None:
+        entry = TimeEntry.from_dict({"id": "1", "activityId": "a1", "startedAt": "2023-01-01T09:00:00.000", "stoppedAt": None})
+        self.assertEqual(entry.started_at, datetime(2023, 1, 1, 9, tzinfo=timezone.utc))
+        self.assertIsNone(entry.duration_seconds)
+
+    def test_convert_payload(self) -> None:
+        payload = convert_payload({
+            "activities": [{"id": "1", "name": "Work", "color": "#fff", "spaceId": "s1"}],
+            "tags": [{"id": 2, "key": "k", "label": "billable", "scope": "timeular", "spaceId": "s1"}],
+            "mentions": [{"id": 3, "label": "alice"}],
+            "currentTracking": {"activityId": "1", "startedAt": "2023-01-01T09:00:00.000", "note": {"text": "hi"}},
+            "other": [1, 2],
+        })
+        self.assertEqual(payload["activities"], [Activity("1", "Work", "#fff", space_id="s1")])
+        self.assertEqual(payload["tags"], [Tag("2", "billable", "k", "timeular", "s1")])
+        self.assertIsInstance(payload["mentions"][0], Mention)
+        self.assertEqual(payload["mentions"][0].to_dict()["label"], "alice")
+        self.assertEqual(payload["currentTracking"], Tracking(None, "1", datetime(2023, 1, 1, 9, tzinfo=timezone.utc), "hi"))
+        self.assertEqual(payload["other"], [1, 2])
+        self.assertEqual(convert_payload({"currentTracking": None}), {"currentTracking": None})
+
+    def test_to_dict(self) -> None:
+        entry = TimeEntry("1", "a1", datetime(2023, 1, 1, 9, tzinfo=timezone.utc), None)
+        self.assertEqual(entry.to_dict(), {
+            "id": "1", "activity_id": "a1", "started_at": "2023-01-01T09:00:00+00:00",
+            "stopped_at": None, "note": None, "tags": (), "mentions": (),
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Mapping, Optional, Tuple, Union
+
+from timeular import Timeout, TimeularClient, TokenCache
+from timeular_http import create_session
+from timeular_retry import RateLimiter
+
+Credentials = Union[Mapping[str, Tuple[str, str]], Callable[[str], Tuple[str, str]]]
+
+
+class ClientPool:
+    """Clients for many tenants (API key/secret pairs) sharing one connection pool.
+
+    Clients are created on first use and sign in lazily on their first
+    request. At most ``max_clients`` are kept; the least recently used one
+    is dropped, together with its token, when another tenant needs a slot
+    (pass a ``token_cache`` to keep tokens across evictions). With ``rate``
+    set, every tenant gets its own token bucket, so a busy tenant is
+    throttled without slowing the others down. Other keyword arguments are
+    passed to every client, so don't pass per-account state such as a
+    ``ResponseCache`` here.
+    """
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        max_clients: int = 1024,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        pool_maxsize: int = 100,
+        pool_block: bool = False,
+        timeout: Optional[Timeout] = (5.0, 30.0),
+        token_cache: Optional[TokenCache] = None,
+        **client_kwargs: Any,
+    ) -> None:
+        if max_clients < 1:
+            raise ValueError("max_clients must be at least 1")
+        self._credentials = credentials
+        self.max_clients = max_clients
+        self.rate = rate
+        self.burst = burst
+        self.token_cache = token_cache
+        self.client_kwargs = client_kwargs
+        self.session = create_session(1, pool_maxsize, pool_block, True, timeout)
+        self._clients: "OrderedDict[str, TimeularClient]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup_credentials(self, tenant: str) -> Tuple[str, str]:
+        if callable(self._credentials):
+            return self._credentials(tenant)
+        return self._credentials[tenant]
+
+    def client(self, tenant: str) -> TimeularClient:
+        with self._lock:
+            client = self._clients.get(tenant)
+            if client is not None:
+                self._clients.move_to_end(tenant)
+                return client
+        api_key, api_secret = self._lookup_credentials(tenant)
+        client = TimeularClient(
+            api_key,
+            api_secret,
+            session=self.session,
+            token_cache=self.token_cache,
+            rate_limiter=RateLimiter(self.rate, self.burst) if self.rate is not None else None,
+            **self.client_kwargs,
+        )
+        with self._lock:
+            # Another thread may have created the same tenant meanwhile.
+            existing = self._clients.get(tenant)
+            if existing is not None:
+                self._clients.move_to_end(tenant)
+                return existing
+            self._clients[tenant] = client
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        return client
+
+    __getitem__ = client
+
+    def evict(self, tenant: str) -> None:
+        with self._lock:
+            self._clients.pop(tenant, None)
+
+    def __contains__(self, tenant: object) -> bool:
+        return tenant in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def close(self) -> None:
+        with self._lock:
+            self._clients.clear()
+        self.session.close()
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
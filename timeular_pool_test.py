@@ -0,0 +1,62 @@
+import unittest
+from typing import Any
+from unittest.mock import patch
+
+from timeular_mockserver import MockTimeularServer
+from timeular_pool import ClientPool
+
+
+class TestClientPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.credentials = {f"tenant{i}": (f"key{i}", f"secret{i}") for i in range(5)}
+        self.pool = ClientPool(self.credentials, max_clients=3, rate=10.0)
+        self.addCleanup(self.pool.close)
+
+    @patch('requests.Session.post')
+    def test_clients_share_session_and_sign_in_lazily(self, mock_post: Any) -> None:
+        first = self.pool.client("tenant0")
+        second = self.pool["tenant1"]
+        self.assertIs(self.pool.client("tenant0"), first)
+        self.assertIs(first.session, self.pool.session)
+        self.assertIs(second.session, self.pool.session)
+        self.assertEqual((first.api_key, second.api_secret), ("key0", "secret1"))
+        mock_post.assert_not_called()
+
+    def test_per_tenant_rate_limiters(self) -> None:
+        first, second = self.pool.client("tenant0"), self.pool.client("tenant1")
+        self.assertIsNot(first.rate_limiter, second.rate_limiter)
+        self.assertEqual(first.rate_limiter.rate, 10.0)
+
+    def test_least_recently_used_client_is_evicted(self) -> None:
+        for tenant in ("tenant0", "tenant1", "tenant2"):
+            self.pool.client(tenant)
+        self.pool.client("tenant0")
+        self.pool.client("tenant3")
+        self.assertEqual(len(self.pool), 3)
+        self.assertNotIn("tenant1", self.pool)
+        self.assertIn("tenant0", self.pool)
+        self.pool.evict("tenant0")
+        self.assertNotIn("tenant0", self.pool)
+
+    def test_callable_credentials(self) -> None:
+        pool = ClientPool(lambda tenant: (tenant + "_key", "secret"))
+        self.addCleanup(pool.close)
+        self.assertEqual(pool.client("acme").api_key, "acme_key")
+        self.assertIsNone(pool.client("acme").rate_limiter)
+        with self.assertRaises(KeyError):
+            self.pool.client("unknown")
+
+    def test_closing_a_client_keeps_the_shared_session_open(self) -> None:
+        with MockTimeularServer(entries=2) as server:
+            clients = [self.pool.client(tenant) for tenant in ("tenant0", "tenant1")]
+            for client in clients:
+                client.base_url = server.url
+            clients[0].close()
+            for client in clients:
+                self.assertEqual(len(client.get_time_entries()["timeEntries"]), 2)
+            # one sign-in and one read per tenant
+            self.assertEqual(server.requests, 4)
+
+if __name__ == '__main__':
+    unittest.main()
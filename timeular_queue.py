@@ -0,0 +1,248 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import requests
+
+from timeular import TimeularClient
+from timeular_retry import is_retryable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    tracking_id TEXT,
+    queued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS operations_tracking ON operations (tracking_id);
+CREATE TABLE IF NOT EXISTS failed_operations (
+    seq INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+START = "start_tracking"
+STOP = "stop_current_activity"
+EDIT = "edit_tracking"
+
+
+class QueuedOperation(NamedTuple):
+    seq: int
+    name: str
+    args: Dict[str, Any]
+    queued_at: float
+
+
+class MutationQueue:
+    """Durable write-ahead queue for tracking mutations.
+
+    ``start_tracking``, ``stop_current_activity`` and ``edit_tracking`` only
+    append to a local SQLite journal and return; a background thread sends
+    the journal to the API in order. While the API is unreachable (connection
+    errors, timeouts, 408/429/5xx) the head of the queue is retried with
+    backoff and nothing behind it is sent; other failures are moved to
+    ``failed_operations`` so they don't block the queue.
+
+    Pending operations are coalesced as they are queued: a stop queued
+    within ``coalesce_window`` seconds of the pending start right before it
+    cancels both, a repeated stop is dropped, and an edit replaces pending
+    edits of the same tracking that have no start or stop queued after them.
+    The operation currently being sent is never touched. A start and stop
+    further apart are both sent, since together they record tracked time (or
+    stop a tracking that was already running upstream).
+
+    Replayed starts and stops take effect when they reach the API, so the
+    tracked time is stamped with the flush time, not the time they were
+    queued; ``queued_at`` keeps the original time for callers that want to
+    correct it with ``edit_tracking``.
+    """
+
+    def __init__(
+        self,
+        client: TimeularClient,
+        path: str,
+        retry_interval: float = 1.0,
+        max_backoff: float = 60.0,
+        on_error: Optional[Callable[[QueuedOperation, BaseException], None]] = None,
+        start: bool = True,
+        coalesce_window: float = 5.0,
+    ) -> None:
+        self.client = client
+        self.coalesce_window = coalesce_window
+        self.retry_interval = retry_interval
+        self.max_backoff = max_backoff
+        self.on_error = on_error
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL with synchronous=NORMAL keeps appends durable across process
+        # crashes without an fsync per call.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._inflight: Optional[int] = None
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if start:
+            self.start()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="timeular-mutation-queue", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the flusher, after giving it up to ``timeout`` seconds to drain the queue."""
+        if timeout:
+            self.flush(timeout)
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.conn.close()
+
+    def __enter__(self) -> "MutationQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start_tracking(self, activity_id: str) -> None:
+        self._enqueue(START, {"activity_id": activity_id})
+
+    def stop_current_activity(self) -> None:
+        self._enqueue(STOP, {})
+
+    def edit_tracking(self, tracking_id: str, started_at: str, stopped_at: str) -> None:
+        self._enqueue(EDIT, {"tracking_id": tracking_id, "started_at": started_at, "stopped_at": stopped_at})
+
+    def _enqueue(self, name: str, args: Dict[str, Any]) -> None:
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                if not self._coalesce(name, args, now):
+                    self.conn.execute(
+                        "INSERT INTO operations (name, args, tracking_id, queued_at) VALUES (?, ?, ?, ?)",
+                        (name, json.dumps(args), args.get("tracking_id"), now),
+                    )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self._changed.notify_all()
+
+    def _coalesce(self, name: str, args: Dict[str, Any], now: float) -> bool:
+        """Fold the new operation into the pending tail; True if nothing needs inserting."""
+        inflight = self._inflight if self._inflight is not None else -1
+        if name == STOP:
+            last = self.conn.execute(
+                "SELECT seq, name, queued_at FROM operations WHERE seq != ? ORDER BY seq DESC LIMIT 1", (inflight,)
+            ).fetchone()
+            if last is not None and last[1] == START:
+                if now - last[2] >= self.coalesce_window:
+                    return False
+                self.conn.execute("DELETE FROM operations WHERE seq = ?", (last[0],))
+                return True
+            return last is not None and last[1] == STOP
+        if name == EDIT:
+            self.conn.execute(
+                "DELETE FROM operations WHERE tracking_id = ? AND seq != ? "
+                "AND seq > (SELECT COALESCE(MAX(seq), 0) FROM operations WHERE name != ?)",
+                (args["tracking_id"], inflight, EDIT),
+            )
+        return False
+
+    def pending(self) -> List[QueuedOperation]:
+        with self._lock:
+            rows = self.conn.execute("SELECT seq, name, args, queued_at FROM operations ORDER BY seq").fetchall()
+        return [QueuedOperation(seq, name, json.loads(args), queued_at) for seq, name, args, queued_at in rows]
+
+    def failed(self) -> List[QueuedOperation]:
+        with self._lock:
+            rows = self.conn.execute("SELECT seq, name, args, queued_at FROM failed_operations ORDER BY seq").fetchall()
+        return [QueuedOperation(seq, name, json.loads(args), queued_at) for seq, name, args, queued_at in rows]
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued operation has been sent or failed; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._changed.notify_all()
+            while self.conn.execute("SELECT 1 FROM operations LIMIT 1").fetchone() is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def send_pending(self) -> int:
+        """Send queued operations in order from the calling thread.
+
+        Stops at the first operation that fails with a retryable error and
+        re-raises it. Returns the number of operations taken off the queue.
+        """
+        done = 0
+        while True:
+            with self._lock:
+                row = self.conn.execute("SELECT seq, name, args, queued_at FROM operations ORDER BY seq LIMIT 1").fetchone()
+                if row is None:
+                    return done
+                op = QueuedOperation(row[0], row[1], json.loads(row[2]), row[3])
+                self._inflight = op.seq
+            try:
+                getattr(self.client, op.name)(**op.args)
+            except requests.RequestException as exc:
+                if is_retryable(exc):
+                    with self._lock:
+                        self._inflight = None
+                    raise
+                self._finish(op, exc)
+            except Exception as exc:
+                self._finish(op, exc)
+            else:
+                self._finish(op, None)
+            done += 1
+
+    def _finish(self, op: QueuedOperation, error: Optional[BaseException]) -> None:
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if error is not None:
+                self.conn.execute(
+                    "INSERT INTO failed_operations (seq, name, args, queued_at, error, failed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (op.seq, op.name, json.dumps(op.args), op.queued_at, repr(error), time.time()),
+                )
+            self.conn.execute("DELETE FROM operations WHERE seq = ?", (op.seq,))
+            self.conn.execute("COMMIT")
+            self._inflight = None
+            self._changed.notify_all()
+        if error is not None and self.on_error is not None:
+            self.on_error(op, error)
+
+    def _run(self) -> None:
+        backoff = 0.0
+        retry_at = 0.0
+        while True:
+            with self._lock:
+                while not self._closed:
+                    delay = retry_at - time.monotonic()
+                    if delay <= 0 and self.conn.execute("SELECT 1 FROM operations LIMIT 1").fetchone() is not None:
+                        break
+                    self._changed.wait(delay if delay > 0 else None)
+                if self._closed:
+                    return
+            try:
+                self.send_pending()
+            except requests.RequestException:
+                backoff = min(self.max_backoff, max(self.retry_interval, backoff * 2))
+                retry_at = time.monotonic() + backoff
+            else:
+                backoff = 0.0
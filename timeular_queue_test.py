@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+import unittest
+from typing import Any, List
+from unittest.mock import Mock, patch
+
+import requests
+
+from timeular_queue import MutationQueue
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestMutationQueue(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.client = Mock()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(self.dir, "queue.db")
+        self.queue = MutationQueue(self.client, self.path, start=False)
+        self.addCleanup(lambda: self.queue.close())
+
+    def names(self) -> List[Any]:
+        return [(op.name, op.args) for op in self.queue.pending()]
+
+    def test_sends_in_order(self) -> None:
+        self.queue.start_tracking("a1")
+        self.queue.edit_tracking("t1", "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+        self.queue.stop_current_activity()
+        self.assertEqual(self.queue.send_pending(), 3)
+        self.assertEqual([c[0] for c in self.client.method_calls], ["start_tracking", "edit_tracking", "stop_current_activity"])
+        self.client.edit_tracking.assert_called_once_with(
+            tracking_id="t1", started_at="2023-01-01T09:00:00.000", stopped_at="2023-01-01T10:00:00.000"
+        )
+        self.assertEqual(self.queue.pending(), [])
+
+    def test_coalescing(self) -> None:
+        self.queue.stop_current_activity()
+        self.queue.stop_current_activity()
+        self.queue.start_tracking("a1")
+        self.queue.stop_current_activity()
+        self.queue.edit_tracking("t1", "s1", "e1")
+        self.queue.edit_tracking("t2", "s2", "e2")
+        self.queue.edit_tracking("t1", "s3", "e3")
+        self.assertEqual(self.names(), [
+            ("stop_current_activity", {}),
+            ("edit_tracking", {"tracking_id": "t2", "started_at": "s2", "stopped_at": "e2"}),
+            ("edit_tracking", {"tracking_id": "t1", "started_at": "s3", "stopped_at": "e3"}),
+        ])
+
+    def test_start_and_stop_apart_are_both_sent(self) -> None:
+        with patch("time.time", side_effect=[1000.0, 1000.0 + 2 * 3600]):
+            self.queue.start_tracking("a1")
+            self.queue.stop_current_activity()
+        self.assertEqual(self.names(), [("start_tracking", {"activity_id": "a1"}), ("stop_current_activity", {})])
+        self.assertEqual([op.queued_at for op in self.queue.pending()], [1000.0, 1000.0 + 2 * 3600])
+
+    def test_coalesce_window(self) -> None:
+        queue = MutationQueue(self.client, os.path.join(self.dir, "window.db"), start=False, coalesce_window=0)
+        self.addCleanup(queue.close)
+        queue.start_tracking("a1")
+        queue.stop_current_activity()
+        self.assertEqual(len(queue.pending()), 2)
+
+    def test_edits_are_not_coalesced_across_starts(self) -> None:
+        self.queue.edit_tracking("t1", "s1", "e1")
+        self.queue.start_tracking("a1")
+        self.queue.edit_tracking("t1", "s2", "e2")
+        self.assertEqual(len(self.queue.pending()), 3)
+
+    def test_survives_outage_and_restart(self) -> None:
+        self.client.start_tracking.side_effect = requests.ConnectionError()
+        self.queue.start_tracking("a1")
+        self.queue.edit_tracking("t1", "s1", "e1")
+        with self.assertRaises(requests.ConnectionError):
+            self.queue.send_pending()
+        self.client.edit_tracking.assert_not_called()
+        self.queue.close()
+
+        self.client.start_tracking.side_effect = None
+        self.queue = MutationQueue(self.client, self.path, start=False)
+        self.assertEqual([name for name, _ in self.names()], ["start_tracking", "edit_tracking"])
+        self.assertEqual(self.queue.send_pending(), 2)
+
+    def test_client_errors_are_moved_aside(self) -> None:
+        errors = []
+        self.queue.on_error = lambda op, exc: errors.append(op.name)
+        self.client.edit_tracking.side_effect = http_error(404)
+        self.queue.edit_tracking("t1", "s1", "e1")
+        self.queue.stop_current_activity()
+        self.assertEqual(self.queue.send_pending(), 2)
+        self.client.stop_current_activity.assert_called_once_with()
+        self.assertEqual([op.name for op in self.queue.failed()], ["edit_tracking"])
+        self.assertEqual(errors, ["edit_tracking"])
+
+    def test_background_flusher(self) -> None:
+        sent = threading.Event()
+        self.client.start_tracking.side_effect = [http_error(503), {}]
+        self.client.stop_current_activity.side_effect = lambda: sent.set()
+        queue = MutationQueue(self.client, os.path.join(self.dir, "q.db"), retry_interval=0.01)
+        self.addCleanup(queue.close)
+        queue.start_tracking("a1")
+        queue.edit_tracking("t1", "s1", "e1")
+        queue.stop_current_activity()
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertTrue(sent.is_set())
+        self.assertEqual(self.client.start_tracking.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple, Type
+
+import requests
+
+from timeular import DateLike, TimeularClient, date_windows, merge_windows
+from timeular_models import TimeEntry, to_model
+from timeular_retry import error_status, is_retryable
+
+if TYPE_CHECKING:
+    from timeular_async import AsyncTimeularClient
+
+Shard = Tuple[date, date]
+
+
+def _retry_shard(client: Any, exc: BaseException) -> bool:
+    # Statuses the client's RetryPolicy handles have already been retried
+    # inside generate_report; retrying the shard on top would multiply the
+    # attempts. Other failures (connection errors, timeouts, 5xx the policy
+    # won't retry for a POST) are retried here, paid for from the client's
+    # retry budget.
+    if not is_retryable(exc):
+        return False
+    policy = client.retry_policy
+    if error_status(exc) in policy.statuses:
+        return False
+    return policy.budget.withdraw()
+
+
+class ReportEngine:
+    """Fetch large report ranges as date shards on a thread pool.
+
+    Shards are fetched concurrently (at most ``max_workers`` at a time, with
+    at most ``2 * max_workers`` shard results buffered), retried on their own
+    when they fail with an error the client doesn't retry itself, and merged
+    back in date order with duplicates removed.
+    """
+
+    def __init__(
+        self,
+        client: TimeularClient,
+        shard: timedelta = timedelta(days=30),
+        max_workers: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        retry_on: Tuple[Type[BaseException], ...] = (requests.RequestException,),
+    ) -> None:
+        self.client = client
+        self.shard = shard
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retry_on = retry_on
+
+    def _fetch_shard(self, shard: Shard) -> List[Any]:
+        start, end = shard
+        for attempt in range(self.max_attempts):
+            try:
+                report = self.client.generate_report(start.isoformat(), end.isoformat())
+                return report.get("timeEntries") or []
+            except self.retry_on as exc:
+                if attempt + 1 >= self.max_attempts or not _retry_shard(self.client, exc):
+                    raise
+                time.sleep(self.retry_delay * 2 ** attempt)
+        return []
+
+    def iter_shards(self, start_date: DateLike, end_date: DateLike) -> Iterator[List[Any]]:
+        shards = date_windows(start_date, end_date, self.shard)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Deque["Future[List[Any]]"] = deque()
+            try:
+                for shard in shards:
+                    pending.append(executor.submit(self._fetch_shard, shard))
+                    if len(pending) >= 2 * self.max_workers:
+                        break
+                while pending:
+                    entries = pending.popleft().result()
+                    shard = next(shards, None)
+                    if shard is not None:
+                        pending.append(executor.submit(self._fetch_shard, shard))
+                    yield entries
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def iter_time_entries(self, start_date: DateLike, end_date: DateLike) -> Iterator[TimeEntry]:
+        for data in merge_windows(self.iter_shards(start_date, end_date)):
+            yield to_model(TimeEntry, data)
+
+    def generate_report(self, start_date: DateLike, end_date: DateLike) -> Dict[str, Any]:
+        return {"timeEntries": list(merge_windows(self.iter_shards(start_date, end_date)))}
+
+
+class AsyncReportEngine:
+    """asyncio counterpart of ReportEngine driving an AsyncTimeularClient."""
+
+    def __init__(
+        self,
+        client: "AsyncTimeularClient",
+        shard: timedelta = timedelta(days=30),
+        max_concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        retry_on: Optional[Tuple[Type[BaseException], ...]] = None,
+    ) -> None:
+        if retry_on is None:
+            import aiohttp
+
+            retry_on = (aiohttp.ClientError, asyncio.TimeoutError)
+        self.client = client
+        self.shard = shard
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retry_on = retry_on
+
+    async def _fetch_shard(self, shard: Shard) -> List[Any]:
+        start, end = shard
+        for attempt in range(self.max_attempts):
+            try:
+                report = await self.client.generate_report(start.isoformat(), end.isoformat())
+                return report.get("timeEntries") or []
+            except self.retry_on as exc:
+                if attempt + 1 >= self.max_attempts or not _retry_shard(self.client, exc):
+                    raise
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+        return []
+
+    async def iter_shards(self, start_date: DateLike, end_date: DateLike) -> AsyncIterator[List[Any]]:
+        shards = date_windows(start_date, end_date, self.shard)
+        pending: Deque["asyncio.Task[List[Any]]"] = deque()
+        try:
+            for shard in shards:
+                pending.append(asyncio.ensure_future(self._fetch_shard(shard)))
+                if len(pending) >= self.max_concurrency:
+                    break
+            while pending:
+                entries = await pending.popleft()
+                shard = next(shards, None)
+                if shard is not None:
+                    pending.append(asyncio.ensure_future(self._fetch_shard(shard)))
+                yield entries
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def generate_report(self, start_date: DateLike, end_date: DateLike) -> Dict[str, Any]:
+        shards = [entries async for entries in self.iter_shards(start_date, end_date)]
+        return {"timeEntries": list(merge_windows(shards))}
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from unittest.mock import Mock
+import requests
+from timeular_reports import AsyncReportEngine, ReportEngine
+from timeular_retry import RetryBudget, RetryPolicy
+from typing import Any, Dict, List
+
+
+def entries_for(start_date: str, end_date: str) -> Dict[str, Any]:
+    # One entry per shard plus one that straddles into the next shard.
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    return {"timeEntries": [
+        {"id": f"{start}", "activityId": "a1"},
+        {"id": f"edge-{end}", "activityId": "a1"},
+        {"id": f"edge-{start - timedelta(days=1)}", "activityId": "a1"},
+    ]}
+
+
+class TestReportEngine(unittest.TestCase):
+
+    def test_shards_run_concurrently_and_merge_in_order(self) -> None:
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def generate_report(start_date: str, end_date: str) -> Dict[str, Any]:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return entries_for(start_date, end_date)
+
+        client = Mock(retry_policy=RetryPolicy())
+        client.generate_report.side_effect = generate_report
+        engine = ReportEngine(client, shard=timedelta(days=10), max_workers=3)
+        report = engine.generate_report("2023-01-01", "2023-02-09")
+        ids = [entry["id"] for entry in report["timeEntries"]]
+        self.assertEqual(ids, [
+            "2023-01-01", "edge-2023-01-10", "edge-2022-12-31",
+            "2023-01-11", "edge-2023-01-20",
+            "2023-01-21", "edge-2023-01-30",
+            "2023-01-31", "edge-2023-02-09",
+        ])
+        self.assertEqual(client.generate_report.call_count, 4)
+        self.assertEqual(peak, 3)
+
+    def test_entry_spanning_many_shards_is_merged_once(self) -> None:
+        client = Mock(retry_policy=RetryPolicy())
+        client.generate_report.side_effect = lambda start_date, end_date: {
+            "timeEntries": [{"id": "long"}, {"id": start_date}],
+        }
+        engine = ReportEngine(client, shard=timedelta(days=1), max_workers=2)
+        ids = [entry["id"] for entry in engine.generate_report("2023-01-01", "2023-01-04")["timeEntries"]]
+        self.assertEqual(ids, ["long", "2023-01-01", "2023-01-02", "2023-01-03", "2023-01-04"])
+
+    def test_failed_shard_is_retried_alone(self) -> None:
+        failures = {"2023-01-11": 1}
+
+        def generate_report(start_date: str, end_date: str) -> Dict[str, Any]:
+            if failures.get(start_date):
+                failures[start_date] -= 1
+                raise requests.ConnectionError("reset")
+            return entries_for(start_date, end_date)
+
+        client = Mock(retry_policy=RetryPolicy())
+        client.generate_report.side_effect = generate_report
+        engine = ReportEngine(client, shard=timedelta(days=10), retry_delay=0)
+        entries = list(engine.iter_time_entries("2023-01-01", "2023-01-20"))
+        self.assertEqual(len(entries), 5)
+        starts: List[str] = [c.args[0] for c in client.generate_report.call_args_list]
+        self.assertEqual(sorted(starts), ["2023-01-01", "2023-01-11", "2023-01-11"])
+
+    def test_client_errors_are_not_retried(self) -> None:
+        response = requests.Response()
+        response.status_code = 400
+        client = Mock(retry_policy=RetryPolicy())
+        client.generate_report.side_effect = requests.HTTPError(response=response)
+        engine = ReportEngine(client, retry_delay=0)
+        with self.assertRaises(requests.HTTPError):
+            engine.generate_report("2023-01-01", "2023-01-05")
+        self.assertEqual(client.generate_report.call_count, 1)
+
+    def test_statuses_the_client_retries_are_not_retried_again(self) -> None:
+        response = requests.Response()
+        response.status_code = 503
+        client = Mock(retry_policy=RetryPolicy())
+        client.generate_report.side_effect = requests.HTTPError(response=response)
+        with self.assertRaises(requests.HTTPError):
+            ReportEngine(client, retry_delay=0).generate_report("2023-01-01", "2023-01-05")
+        self.assertEqual(client.generate_report.call_count, 1)
+
+    def test_shard_retries_are_paid_from_the_retry_budget(self) -> None:
+        client = Mock(retry_policy=RetryPolicy(budget=RetryBudget(ratio=0, reserve=1)))
+        client.generate_report.side_effect = requests.ConnectionError("reset")
+        with self.assertRaises(requests.ConnectionError):
+            ReportEngine(client, retry_delay=0, max_attempts=5).generate_report("2023-01-01", "2023-01-05")
+        self.assertEqual(client.generate_report.call_count, 2)
+
+
+class TestAsyncReportEngine(unittest.IsolatedAsyncioTestCase):
+
+    async def test_generate_report(self) -> None:
+        async def generate_report(start_date: str, end_date: str) -> Dict[str, Any]:
+            await asyncio.sleep(0)
+            return entries_for(start_date, end_date)
+
+        client = Mock(retry_policy=RetryPolicy())
+        client.generate_report.side_effect = generate_report
+        engine = AsyncReportEngine(client, shard=timedelta(days=10), max_concurrency=2)
+        report = await engine.generate_report("2023-01-01", "2023-01-20")
+        ids = [entry["id"] for entry in report["timeEntries"]]
+        self.assertEqual(ids, ["2023-01-01", "edge-2023-01-10", "edge-2022-12-31", "2023-01-11", "edge-2023-01-20"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Collection, Mapping, Optional
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+
+class RateLimiter:
+    """Token bucket shared by every client (sync or async) it is passed to.
+
+    Callers reserve a token up front and then sleep outside the lock until
+    their reservation comes due, so waiting callers are served in order and
+    never hold the lock while sleeping. ``pause`` pushes every caller back,
+    which is how a 429/503 from one request slows down all of them.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            import asyncio
+
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class RetryBudget:
+    """Cap retries at ``ratio`` of requests, plus a reserve of ``reserve`` retries."""
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0) -> None:
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by a requests or aiohttp error, if any."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(exc, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    # Client errors other than timeouts and rate limiting will fail the
+    # same way on every attempt.
+    status = error_status(exc)
+    return not (status is not None and 400 <= status < 500 and status not in (408, 429))
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class RetryPolicy:
+    """Decide whether and when to retry a response.
+
+    429 and 503 responses mean the request was not processed and are retried
+    for any method; other ``idempotent_statuses`` only for idempotent methods.
+    Delays honour Retry-After and otherwise use full-jitter exponential
+    backoff. Every retry is paid for from ``budget``.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        statuses: Collection[int] = (429, 503),
+        idempotent_statuses: Collection[int] = (500, 502, 504),
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.statuses = frozenset(statuses)
+        self.idempotent_statuses = frozenset(idempotent_statuses)
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def record_request(self) -> None:
+        self.budget.deposit()
+
+    def retry_delay(self, method: str, status: int, headers: Mapping[str, str], attempt: int) -> Optional[float]:
+        """Return the delay before retry number ``attempt + 1``, or None to give up."""
+        if status not in self.statuses and not (
+            status in self.idempotent_statuses and method.upper() in IDEMPOTENT_METHODS
+        ):
+            return None
+        if attempt >= self.max_retries or not self.budget.withdraw():
+            return None
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            # A little jitter keeps clients that got the same Retry-After
+            # from coming back in lockstep.
+            return retry_after + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from timeular_retry import RateLimiter, RetryBudget, RetryPolicy, is_retryable, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_burst_then_steady_rate(self) -> None:
+        clock = FakeClock()
+        limiter = RateLimiter(rate=2, burst=2, clock=clock)
+        self.assertEqual([limiter.reserve() for _ in range(4)], [0.0, 0.0, 0.5, 1.0])
+        clock.now = 2.0
+        self.assertEqual(limiter.reserve(), 0.0)
+
+    def test_pause_delays_every_caller(self) -> None:
+        clock = FakeClock()
+        limiter = RateLimiter(rate=10, clock=clock)
+        limiter.pause(3)
+        self.assertEqual(limiter.reserve(), 3.0)
+        clock.now = 3.0
+        self.assertEqual(limiter.reserve(), 0.0)
+
+    @patch('asyncio.sleep')
+    def test_acquire_async(self, mock_sleep: object) -> None:
+        limiter = RateLimiter(rate=1, burst=1, clock=FakeClock())
+        asyncio.run(limiter.acquire_async())
+        asyncio.run(limiter.acquire_async())
+        mock_sleep.assert_called_once_with(1.0)  # type: ignore[attr-defined]
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_budget(self) -> None:
+        budget = RetryBudget(ratio=0.5, reserve=1)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_parse_retry_after(self) -> None:
+        now = datetime(2024, 9, 12, 13, 52, 17, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertEqual(parse_retry_after("Thu, 12 Sep 2024 13:52:27 GMT", now), 10.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_retry_delay(self) -> None:
+        policy = RetryPolicy(max_retries=2, backoff_base=1, backoff_max=3)
+        self.assertIsNone(policy.retry_delay("GET", 404, {}, 0))
+        self.assertIsNone(policy.retry_delay("POST", 502, {}, 0))
+        self.assertLessEqual(policy.retry_delay("GET", 502, {}, 0), 1)
+        self.assertGreaterEqual(policy.retry_delay("POST", 429, {"Retry-After": "5"}, 1), 5)
+        self.assertIsNone(policy.retry_delay("POST", 429, {}, 2))
+
+    def test_retry_delay_respects_budget(self) -> None:
+        policy = RetryPolicy(budget=RetryBudget(ratio=0, reserve=1))
+        self.assertIsNotNone(policy.retry_delay("GET", 503, {}, 0))
+        self.assertIsNone(policy.retry_delay("GET", 503, {}, 0))
+
+    def test_is_retryable(self) -> None:
+        def error(status: int) -> Exception:
+            exc = Exception()
+            exc.status = status  # type: ignore[attr-defined]
+            return exc
+
+        self.assertTrue(is_retryable(ConnectionError()))
+        self.assertEqual([is_retryable(error(s)) for s in (400, 404, 408, 429, 503)], [False, False, True, True, True])
+
+if __name__ == '__main__':
+    unittest.main()
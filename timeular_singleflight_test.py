@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from timeular_singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_result(self) -> None:
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch() -> bytes:
+            calls.append(1)
+            release.wait(5)
+            return b"body"
+
+        with ThreadPoolExecutor(8) as executor:
+            futures = [executor.submit(flight.do, "/tracking", fetch) for _ in range(8)]
+            time.sleep(0.05)
+            release.set()
+            self.assertEqual([f.result() for f in futures], [b"body"] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.do("/tracking", lambda: b"again"), b"again")
+
+    def test_errors_are_shared(self) -> None:
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail() -> Any:
+            started.set()
+            release.wait(5)
+            raise ValueError("down")
+
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(flight.do, "k", fail)
+            started.wait(5)
+            follower = executor.submit(flight.do, "k", lambda: "unused")
+            time.sleep(0.05)
+            release.set()
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, follower.result)
+
+    def test_forget(self) -> None:
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow() -> str:
+            started.set()
+            release.wait(5)
+            return "old"
+
+        with ThreadPoolExecutor(1) as executor:
+            leader = executor.submit(flight.do, "k", slow)
+            started.wait(5)
+            flight.forget()
+            self.assertEqual(flight.do("k", lambda: "new"), "new")
+            release.set()
+            self.assertEqual(leader.result(), "old")
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_share_one_task(self) -> None:
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch() -> bytes:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return b"body"
+
+        results = await asyncio.gather(*(flight.do("/tracking", fetch) for _ in range(10)))
+        self.assertEqual(results, [b"body"] * 10)
+        self.assertEqual(len(calls), 1)
+
+    async def test_cancelled_caller_does_not_cancel_others(self) -> None:
+        flight = AsyncSingleFlight()
+
+        async def fetch() -> str:
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        first = asyncio.ensure_future(flight.do("k", fetch))
+        second = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, "ok")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import json
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from timeular import DateLike, TimeularClient, to_date
+from timeular_models import Activity, Mention, Tag, TimeEntry, to_model
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    color TEXT,
+    integration TEXT,
+    space_id TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    id TEXT PRIMARY KEY,
+    label TEXT,
+    key TEXT,
+    scope TEXT,
+    space_id TEXT
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    id TEXT PRIMARY KEY,
+    label TEXT,
+    key TEXT,
+    scope TEXT,
+    space_id TEXT
+);
+CREATE TABLE IF NOT EXISTS time_entries (
+    id TEXT PRIMARY KEY,
+    activity_id TEXT,
+    started_at INTEGER,
+    stopped_at INTEGER,
+    note TEXT,
+    tags TEXT,
+    mentions TEXT
+);
+CREATE INDEX IF NOT EXISTS time_entries_activity ON time_entries (activity_id, started_at);
+CREATE INDEX IF NOT EXISTS time_entries_range ON time_entries (started_at, stopped_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+WATERMARK_KEY = "time_entries_watermark"
+
+
+def _to_millis(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def _from_millis(value: Optional[int]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+
+
+class SyncStats(NamedTuple):
+    start: date
+    end: date
+    activities: int
+    tags: int
+    mentions: int
+    time_entries: int
+    deleted: int
+
+
+class SyncStore:
+    """Local SQLite mirror of an account's activities, tags, mentions and time entries.
+
+    The first ``sync`` needs a start date. Later syncs only fetch from the
+    stored watermark (minus ``overlap``, to pick up late edits and running
+    entries) to today, and drop mirrored entries in that range that no
+    longer exist upstream. Timestamps are stored as UTC epoch milliseconds.
+    """
+
+    def __init__(
+        self,
+        client: TimeularClient,
+        path: str,
+        window: timedelta = timedelta(days=30),
+        overlap: timedelta = timedelta(days=2),
+    ) -> None:
+        self.client = client
+        self.path = path
+        self.window = window
+        self.overlap = overlap
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SyncStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def watermark(self) -> Optional[date]:
+        row = self.connection.execute("SELECT value FROM sync_state WHERE key = ?", (WATERMARK_KEY,)).fetchone()
+        return date.fromisoformat(row[0]) if row else None
+
+    def sync(self, start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None) -> SyncStats:
+        watermark = self.watermark
+        if watermark is not None:
+            start = watermark - self.overlap
+        elif start_date is not None:
+            start = to_date(start_date)
+        else:
+            raise ValueError("start_date is required for the first sync")
+        end = to_date(end_date) if end_date is not None else datetime.now(timezone.utc).date()
+
+        with self.connection:
+            activities = self._replace_labels("activities", Activity, self.client.get_activities().get("activities"))
+            tags = self._replace_labels("tags", Tag, self.client.get_tags().get("tags"))
+            mentions = self._replace_labels("mentions", Mention, self.client.get_mentions().get("mentions"))
+            time_entries, deleted = self._sync_time_entries(start, end)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (WATERMARK_KEY, end.isoformat())
+            )
+        return SyncStats(start, end, activities, tags, mentions, time_entries, deleted)
+
+    def _replace_labels(self, table: str, model: Any, items: Optional[List[Any]]) -> int:
+        rows: List[Tuple[Any, ...]] = []
+        for item in items or ():
+            obj = to_model(model, item)
+            rows.append(tuple(getattr(obj, name) for name in model.fields))
+        self.connection.execute(f"DELETE FROM {table}")
+        placeholders = ", ".join("?" * len(model.fields))
+        self.connection.executemany(f"INSERT INTO {table} ({', '.join(model.fields)}) VALUES ({placeholders})", rows)
+        return len(rows)
+
+    def _sync_time_entries(self, start: date, end: date) -> Tuple[int, int]:
+        # Ids seen upstream go to a temp table rather than a Python set so
+        # long ranges stay in bounded memory.
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS seen_time_entries (id TEXT PRIMARY KEY)")
+        self.connection.execute("DELETE FROM seen_time_entries")
+        count = 0
+        for entry in self.client.iter_time_entries(start, end, window=self.window):
+            self.connection.execute(
+                "INSERT OR REPLACE INTO time_entries (id, activity_id, started_at, stopped_at, note, tags, mentions)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.id,
+                    entry.activity_id,
+                    _to_millis(entry.started_at),
+                    _to_millis(entry.stopped_at),
+                    entry.note,
+                    json.dumps(entry.tags),
+                    json.dumps(entry.mentions),
+                ),
+            )
+            self.connection.execute("INSERT OR IGNORE INTO seen_time_entries (id) VALUES (?)", (entry.id,))
+            count += 1
+        range_start = _to_millis(datetime(start.year, start.month, start.day, tzinfo=timezone.utc))
+        range_end = _to_millis(datetime(end.year, end.month, end.day, tzinfo=timezone.utc) + timedelta(days=1))
+        deleted = self.connection.execute(
+            "DELETE FROM time_entries WHERE started_at >= ? AND started_at < ?"
+            " AND id NOT IN (SELECT id FROM seen_time_entries)",
+            (range_start, range_end),
+        ).rowcount
+        return count, deleted
+
+    def iter_time_entries(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        activity_id: Optional[str] = None,
+    ) -> Iterator[TimeEntry]:
+        """Yield mirrored entries that started in ``[start, end)``, oldest first."""
+        query, params = self._where(start, end, activity_id)
+        cursor = self.connection.execute(
+            "SELECT id, activity_id, started_at, stopped_at, note, tags, mentions FROM time_entries"
+            + query + " ORDER BY started_at",
+            params,
+        )
+        for entry_id, entry_activity_id, started_at, stopped_at, note, tags, mentions in cursor:
+            yield TimeEntry(
+                entry_id,
+                entry_activity_id,
+                _from_millis(started_at),
+                _from_millis(stopped_at),
+                note,
+                tuple(json.loads(tags or "[]")),
+                tuple(json.loads(mentions or "[]")),
+            )
+
+    def total_seconds_by_activity(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Dict[str, float]:
+        query, params = self._where(start, end, None)
+        cursor = self.connection.execute(
+            "SELECT activity_id, SUM(stopped_at - started_at) FROM time_entries"
+            + query + (" AND" if query else " WHERE") + " stopped_at IS NOT NULL GROUP BY activity_id",
+            params,
+        )
+        return {activity_id: total / 1000 for activity_id, total in cursor}
+
+    @staticmethod
+    def _where(
+        start: Optional[datetime], end: Optional[datetime], activity_id: Optional[str]
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if activity_id is not None:
+            clauses.append("activity_id = ?")
+            params.append(activity_id)
+        if start is not None:
+            clauses.append("started_at >= ?")
+            params.append(_to_millis(start))
+        if end is not None:
+            clauses.append("started_at < ?")
+            params.append(_to_millis(end))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
@@ -0,0 +1,67 @@
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import Mock
+from timeular_models import TimeEntry
+from timeular_store import SyncStore
+from typing import List
+
+
+def utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestSyncStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.client = Mock()
+        self.client.get_activities.return_value = {"activities": [{"id": "a1", "name": "Work"}, {"id": "a2", "name": "Rest"}]}
+        self.client.get_tags.return_value = {"tags": [{"id": 1, "label": "billable"}]}
+        self.client.get_mentions.return_value = {"mentions": []}
+        self.store = SyncStore(self.client, ":memory:")
+        self.addCleanup(self.store.close)
+
+    def entries(self, *entries: TimeEntry) -> None:
+        self.client.iter_time_entries.return_value = iter(entries)
+
+    def test_first_sync_requires_start_date(self) -> None:
+        with self.assertRaises(ValueError):
+            self.store.sync()
+
+    def test_sync_and_query(self) -> None:
+        self.entries(
+            TimeEntry("1", "a1", utc(2023, 1, 2, 9), utc(2023, 1, 2, 10), "standup", ({"id": 1},)),
+            TimeEntry("2", "a2", utc(2023, 1, 3, 9), utc(2023, 1, 3, 9, 30)),
+            TimeEntry("3", "a1", utc(2023, 1, 4, 9), None),
+        )
+        stats = self.store.sync("2023-01-01", "2023-01-05")
+        self.assertEqual((stats.activities, stats.tags, stats.time_entries, stats.deleted), (2, 1, 3, 0))
+        self.assertEqual(self.store.watermark, date(2023, 1, 5))
+
+        entries: List[TimeEntry] = list(self.store.iter_time_entries(activity_id="a1"))
+        self.assertEqual([e.id for e in entries], ["1", "3"])
+        self.assertEqual(entries[0].tags, ({"id": 1},))
+        self.assertEqual(entries[0].started_at, utc(2023, 1, 2, 9))
+        self.assertEqual([e.id for e in self.store.iter_time_entries(start=utc(2023, 1, 3), end=utc(2023, 1, 4))], ["2"])
+        self.assertEqual(self.store.total_seconds_by_activity(), {"a1": 3600.0, "a2": 1800.0})
+
+    def test_incremental_sync_fetches_delta_and_drops_deleted_entries(self) -> None:
+        self.entries(
+            TimeEntry("1", "a1", utc(2023, 1, 1, 9), utc(2023, 1, 1, 10)),
+            TimeEntry("2", "a1", utc(2023, 1, 9, 9), utc(2023, 1, 9, 10)),
+        )
+        self.store.sync("2023-01-01", "2023-01-10")
+        self.entries(TimeEntry("3", "a2", utc(2023, 1, 11, 9), utc(2023, 1, 11, 10)))
+        stats = self.store.sync(end_date="2023-01-12")
+
+        start, end = self.client.iter_time_entries.call_args.args
+        self.assertEqual((start, end), (date(2023, 1, 8), date(2023, 1, 12)))
+        self.assertEqual(stats.deleted, 1)
+        self.assertEqual([e.id for e in self.store.iter_time_entries()], ["1", "3"])
+
+    def test_indexes_exist(self) -> None:
+        names = {row[0] for row in self.store.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("time_entries_activity", names)
+        self.assertIn("time_entries_range", names)
+
+if __name__ == '__main__':
+    unittest.main()
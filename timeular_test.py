@@ -1,14 +1,34 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from unittest.mock import patch, Mock
-from timeular import TimeularClient
-from typing import Any
+import requests
+from timeular import TimeularClient, TokenCache, date_windows, merge_windows
+from timeular_cache import ResponseCache
+from timeular_metrics import Metrics
+from timeular_models import TimeEntry
+from timeular_retry import RateLimiter, RetryPolicy
+from typing import Any, Dict
+
+# Seconds `import timeular` may take; importing requests alone takes longer.
+IMPORT_BUDGET = 0.1
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
 
 class TestTimeularClient(unittest.TestCase):
 
     def setUp(self) -> None:
         self.client = TimeularClient("fake_api_key", "fake_api_secret")
+        self.client.token = "fake_token"
+        self.addCleanup(self.client.close)
 
-    @patch('timeular.requests.post')
+    @patch('requests.Session.post')
     def test_init_and_get_access_token(self, mock_post: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"token": "fake_token"}
@@ -22,7 +42,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"apiKey": "fake_api_key", "apiSecret": "fake_api_secret"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_get_activities(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"activities": []}
@@ -37,7 +57,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_create_activity(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"activity": {"name": "Test Activity", "color": "#FFFFFF"}}
@@ -53,7 +73,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"name": "Test Activity", "color": "#FFFFFF"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_edit_activity(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"activity": {"name": "Updated Activity", "color": "#000000"}}
@@ -69,7 +89,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"name": "Updated Activity", "color": "#000000"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_archive_activity(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -84,7 +104,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_get_time_entries(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"timeEntries": []}
@@ -99,7 +119,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_stop_current_activity(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -114,7 +134,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_get_current_tracking(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"currentTracking": {}}
@@ -129,7 +149,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_start_tracking(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"tracking": {"activityId": "activity_id"}}
@@ -145,7 +165,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"activityId": "activity_id"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_edit_tracking(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"tracking": {"startedAt": "start_time", "stoppedAt": "stop_time"}}
@@ -161,7 +181,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"startedAt": "start_time", "stoppedAt": "stop_time"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_remove_tracking(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -176,7 +196,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_cancel_tracking(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -191,7 +211,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_find_time_entry(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"timeEntry": {"id": "time_entry_id"}}
@@ -206,7 +226,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_create_time_entry(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"timeEntry": {"activityId": "activity_id", "startedAt": "start_time", "stoppedAt": "stop_time"}}
@@ -222,7 +242,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"activityId": "activity_id", "startedAt": "start_time", "stoppedAt": "stop_time"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_edit_time_entry(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"timeEntry": {"startedAt": "start_time", "stoppedAt": "stop_time"}}
@@ -238,7 +258,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"startedAt": "start_time", "stoppedAt": "stop_time"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_delete_time_entry(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -253,7 +273,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_generate_report(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"report": {}}
@@ -269,7 +289,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"startDate": "2023-01-01", "endDate": "2023-01-31"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_get_tags(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"tags": []}
@@ -284,7 +304,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_create_tag(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"tag": {"label": "Test Tag"}}
@@ -300,7 +320,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"label": "Test Tag"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_edit_tag(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"tag": {"label": "Updated Tag"}}
@@ -316,7 +336,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"label": "Updated Tag"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_delete_tag(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -331,7 +351,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_get_mentions(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"mentions": []}
@@ -346,7 +366,7 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_create_mention(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"mention": {"label": "Test Mention"}}
@@ -362,7 +382,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"label": "Test Mention"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_edit_mention(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {"mention": {"label": "Updated Mention"}}
@@ -378,7 +398,7 @@ class TestTimeularClient(unittest.TestCase):
             json={"label": "Updated Mention"}
         )
 
-    @patch('timeular.requests.request')
+    @patch('requests.Session.request')
     def test_delete_mention(self, mock_request: Any) -> None:
         mock_response = Mock()
         mock_response.json.return_value = {}
@@ -393,5 +413,312 @@ class TestTimeularClient(unittest.TestCase):
             headers={"Authorization": "Bearer fake_token"}
         )
 
+    def test_session_pool_configuration(self) -> None:
+        with patch('requests.Session.post') as mock_post:
+            mock_post.return_value.json.return_value = {"token": "fake_token"}
+            client = TimeularClient("fake_api_key", "fake_api_secret", pool_maxsize=32, timeout=7.5, keep_alive=False)
+        adapter = client.session.get_adapter("https://api.timeular.com")
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.timeout, 7.5)
+        self.assertEqual(client.session.headers["Connection"], "close")
+        client.close()
+
+    def test_session_default_timeout(self) -> None:
+        with patch('requests.Session.post') as mock_post:
+            mock_post.return_value.json.return_value = {"token": "fake_token"}
+            client = TimeularClient("fake_api_key", "fake_api_secret", timeout=7.5)
+        self.addCleanup(client.close)
+        with patch('requests.adapters.HTTPAdapter.send') as mock_send:
+            mock_send.return_value.is_redirect = False
+            client.session.get("https://api.timeular.com/api/v4/activities")
+            client.session.get("https://api.timeular.com/api/v4/activities", timeout=2)
+            client.session.get("https://api.timeular.com/api/v4/activities", timeout=None)
+        self.assertEqual([c.kwargs["timeout"] for c in mock_send.call_args_list], [7.5, 2, None])
+
+    @patch('requests.Session.close')
+    def test_context_manager_closes_session(self, mock_close: Any) -> None:
+        with self.client as client:
+            self.assertIs(client, self.client)
+        mock_close.assert_called_once_with()
+
+    def test_import_does_not_load_vcr(self) -> None:
+        output = subprocess.check_output(
+            [sys.executable, "-c", "import sys, timeular; print('vcr' in sys.modules)"],
+            text=True,
+        )
+        self.assertEqual(output.strip(), "False")
+
+    def test_import_defers_heavy_modules(self) -> None:
+        heavy = ["requests", "urllib3", "vcr", "asyncio", "aiohttp", "ijson", "concurrent.futures", "email.utils"]
+        output = subprocess.check_output(
+            [sys.executable, "-c", f"import sys, timeular; print([m for m in {heavy!r} if m in sys.modules])"],
+            text=True,
+        )
+        self.assertEqual(output.strip(), "[]")
+        output = subprocess.check_output(
+            [sys.executable, "-c", "import sys, timeular; timeular.TimeularClient('k', 's'); print('requests' in sys.modules)"],
+            text=True,
+        )
+        self.assertEqual(output.strip(), "True")
+
+    def test_import_time_budget(self) -> None:
+        # Best of three runs, to keep a busy machine from failing the budget.
+        script = "import time; t = time.perf_counter(); import timeular; print(time.perf_counter() - t)"
+        elapsed = min(float(subprocess.check_output([sys.executable, "-c", script], text=True)) for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+    def test_cassette_replay(self) -> None:
+        client = TimeularClient("fake_api_key", "fake_api_secret", cassette=CASSETTE_DIR + "/get_access_token.yaml", record_mode="none")
+        self.addCleanup(client.close)
+        with self.assertRaises(requests.HTTPError) as ctx:
+            client.token
+        self.assertEqual(ctx.exception.response.status_code, 401)
+
+    @patch('requests.Session.post')
+    def test_sign_in_is_deferred_until_first_request(self, mock_post: Any) -> None:
+        client = TimeularClient("fake_api_key", "fake_api_secret")
+        mock_post.assert_not_called()
+        mock_post.return_value.json.return_value = {"token": "fake_token"}
+        with patch('requests.Session.request') as mock_request:
+            mock_request.return_value.json.return_value = {"activities": []}
+            client.get_activities()
+            client.get_activities()
+        mock_post.assert_called_once()
+
+    @patch('requests.Session.post')
+    @patch('requests.Session.request')
+    def test_concurrent_401_refreshes_token_once(self, mock_request: Any, mock_post: Any) -> None:
+        mock_post.return_value.json.return_value = {"token": "new_token"}
+        barrier = threading.Barrier(8)
+
+        def request(method: str, url: str, headers: Dict[str, str], **kwargs: Any) -> Mock:
+            response = Mock()
+            if headers["Authorization"] == "Bearer expired_token":
+                barrier.wait(timeout=5)
+                response.status_code = 401
+            else:
+                response.status_code = 200
+                response.json.return_value = {"timeEntry": {}}
+            return response
+
+        mock_request.side_effect = request
+        self.client.token = "expired_token"
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.client.find_time_entry, [str(i) for i in range(8)]))
+        self.assertEqual(results, [{"timeEntry": {}}] * 8)
+        mock_post.assert_called_once()
+        self.assertEqual(self.client.token, "new_token")
+
+    @patch('requests.Session.post')
+    def test_token_cache_is_shared_between_clients(self, mock_post: Any) -> None:
+        mock_post.return_value.json.return_value = {"token": "cached_token"}
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TokenCache(os.path.join(directory, "tokens.json"))
+            first = TimeularClient("fake_api_key", "fake_api_secret", token_cache=cache)
+            second = TimeularClient("fake_api_key", "fake_api_secret", token_cache=TokenCache(cache.path))
+            self.assertEqual(first.token, "cached_token")
+            self.assertEqual(second.token, "cached_token")
+            mock_post.assert_called_once()
+            with open(cache.path) as f:
+                self.assertNotIn("fake_api_key", f.read())
+            mock_post.return_value.json.return_value = {"token": "fresh_token"}
+            self.assertEqual(second._refresh_token("cached_token"), "fresh_token")
+            self.assertEqual(first._refresh_token("cached_token"), "fresh_token")
+            self.assertEqual(mock_post.call_count, 2)
+            self.assertEqual(cache.get("fake_api_key"), "fresh_token")
+
+    def test_date_windows(self) -> None:
+        windows = list(date_windows("2023-01-01", date(2023, 3, 5), timedelta(days=30)))
+        self.assertEqual(windows, [
+            (date(2023, 1, 1), date(2023, 1, 30)),
+            (date(2023, 1, 31), date(2023, 3, 1)),
+            (date(2023, 3, 2), date(2023, 3, 5)),
+        ])
+        with self.assertRaises(ValueError):
+            list(date_windows("2023-01-01", "2023-01-02", timedelta(hours=1)))
+
+    def test_merge_windows_spanning_many_windows(self) -> None:
+        windows = [[{"id": "a"}, {"id": "b"}], [{"id": "a"}], [{"id": "a"}, {}], [{"id": "a"}, {"id": "c"}, {}]]
+        self.assertEqual(list(merge_windows(windows)), [{"id": "a"}, {"id": "b"}, {}, {"id": "c"}, {}])
+
+    @patch('requests.Session.request')
+    def test_iter_time_entries(self, mock_request: Any) -> None:
+        def entry(entry_id: str, started_at: str) -> Dict[str, Any]:
+            return {"id": entry_id, "activityId": "a1", "duration": {"startedAt": started_at, "stoppedAt": started_at}}
+
+        pages = [
+            {"timeEntries": [entry("1", "2023-01-01T09:00:00.000"), entry("2", "2023-01-10T23:00:00.000")]},
+            {"timeEntries": [entry("2", "2023-01-10T23:00:00.000"), entry("3", "2023-01-12T09:00:00.000")]},
+        ]
+        mock_request.return_value.json.side_effect = pages
+
+        entries = self.client.iter_time_entries("2023-01-01", "2023-01-20", window=timedelta(days=10))
+        mock_request.assert_not_called()
+        self.assertEqual(next(entries).id, "1")
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual([e.id for e in entries], ["2", "3"])
+        self.assertEqual([c.kwargs["json"] for c in mock_request.call_args_list], [
+            {"startDate": "2023-01-01", "endDate": "2023-01-10"},
+            {"startDate": "2023-01-11", "endDate": "2023-01-20"},
+        ])
+
+    @patch('timeular.time.sleep')
+    @patch('requests.Session.request')
+    def test_retries_429_with_retry_after(self, mock_request: Any, mock_sleep: Any) -> None:
+        limited = Mock(status_code=429, headers={"Retry-After": "2"})
+        ok = Mock(status_code=200)
+        ok.json.return_value = {"activities": []}
+        mock_request.side_effect = [limited, ok]
+        limiter = RateLimiter(rate=100)
+        self.client.rate_limiter = limiter
+
+        self.assertEqual(self.client.get_activities(), {"activities": []})
+        self.assertEqual(mock_request.call_count, 2)
+        delay = mock_sleep.call_args.args[0]
+        self.assertGreaterEqual(delay, 2)
+        self.assertGreater(limiter.reserve(), 1)
+
+    @patch('timeular.time.sleep')
+    @patch('requests.Session.request')
+    def test_gives_up_after_max_retries(self, mock_request: Any, mock_sleep: Any) -> None:
+        unavailable = requests.Response()
+        unavailable.status_code = 503
+        unavailable.raw = io.BytesIO(b"")
+        mock_request.return_value = unavailable
+        self.client.retry_policy = RetryPolicy(max_retries=2)
+
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_activities()
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch('requests.Session.request')
+    def test_cached_reads_and_invalidation(self, mock_request: Any) -> None:
+        def response(status_code: int, body: bytes = b"", etag: str = "") -> Mock:
+            return Mock(status_code=status_code, content=body, headers={"ETag": etag} if etag else {})
+
+        self.client.cache = ResponseCache(ttls={"/tags": 0})
+        mock_request.side_effect = [
+            response(200, b'{"tags": [1]}', '"v1"'),
+            response(304),
+            Mock(status_code=200),
+            response(200, b'{"tags": [2]}', '"v2"'),
+        ]
+        tags = self.client.get_tags()
+        self.assertEqual(tags, {"tags": [1]})
+        tags["tags"].append("mutated")
+        self.assertEqual(self.client.get_tags(), {"tags": [1]})
+        self.assertEqual(mock_request.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+        self.client.edit_tag("1", "renamed")
+        self.assertEqual(self.client.get_tags(), {"tags": [2]})
+        self.assertNotIn("If-None-Match", mock_request.call_args.kwargs["headers"])
+
+    @patch('requests.Session.request')
+    def test_cache_hit_skips_network(self, mock_request: Any) -> None:
+        self.client.cache = ResponseCache()
+        mock_request.return_value = Mock(status_code=200, content=b'{"activities": []}', headers={})
+        self.client.get_activities()
+        self.client.get_activities()
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch('requests.Session.request')
+    def test_models(self, mock_request: Any) -> None:
+        self.client.models = True
+        mock_request.return_value.json.return_value = {"timeEntries": [
+            {"id": "1", "activityId": "a1", "duration": {"startedAt": "2023-01-01T09:00:00.000", "stoppedAt": "2023-01-01T10:00:00.000"}},
+        ]}
+        report = self.client.generate_report("2023-01-01", "2023-01-01")
+        self.assertIsInstance(report["timeEntries"][0], TimeEntry)
+        self.assertEqual(report["timeEntries"][0].duration_seconds, 3600.0)
+        self.assertEqual([e.id for e in self.client.iter_time_entries("2023-01-01", "2023-01-02")], ["1"])
+
+    @patch('requests.Session.request')
+    def test_bulk_edit_time_entries(self, mock_request: Any) -> None:
+        def request(method: str, url: str, **kwargs: Any) -> Mock:
+            response = Mock(status_code=200)
+            if url.endswith("/bad"):
+                response.raise_for_status.side_effect = requests.HTTPError("404")
+            response.json.return_value = {"timeEntry": kwargs["json"]}
+            return response
+
+        mock_request.side_effect = request
+        rows = [{"time_entry_id": entry_id, "started_at": "s", "stopped_at": "e"} for entry_id in ("1", "bad", "2")]
+        results = list(self.client.bulk_edit_time_entries(rows, max_workers=2, ordered=True))
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertIsInstance(results[1].error, requests.HTTPError)
+        self.assertEqual(results[2].result, {"timeEntry": {"startedAt": "s", "stoppedAt": "e"}})
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_stream_report(self, mock_request: Any) -> None:
+        body = b'{"timeEntries": [{"id": "1", "activityId": "a1"}, {"id": "2", "activityId": "a2"}]}'
+        mock_request.return_value = Mock(status_code=200)
+        mock_request.return_value.iter_content.return_value = [body[:30], body[30:]]
+
+        entries = self.client.stream_report("2023-01-01", "2023-01-31")
+        self.assertEqual(next(entries), {"id": "1", "activityId": "a1"})
+        self.assertEqual(list(entries), [{"id": "2", "activityId": "a2"}])
+        mock_request.assert_called_once_with(
+            "POST",
+            "https://api.timeular.com/api/v4/reports/time-entries",
+            headers={"Authorization": "Bearer fake_token"},
+            stream=True,
+            json={"startDate": "2023-01-01", "endDate": "2023-01-31"}
+        )
+        mock_request.return_value.close.assert_called_once_with()
+
+        self.client.stream = True
+        self.client.models = True
+        mock_request.return_value.iter_content.return_value = [body]
+        self.assertEqual([e.activity_id for e in self.client.iter_time_entries("2023-01-01", "2023-01-02")], ["a1", "a2"])
+
+    @patch('timeular.time.sleep')
+    @patch('requests.Session.request')
+    def test_request_hooks_and_metrics(self, mock_request: Any, mock_sleep: Any) -> None:
+        def response(status_code: int, body: bytes) -> requests.Response:
+            result = requests.Response()
+            result.status_code = status_code
+            result._content = body
+            result.request = requests.Request("PATCH", "https://example.invalid", json={"label": "x"}).prepare()
+            return result
+
+        mock_request.side_effect = [response(503, b""), response(200, b'{"tag": {}}')]
+        metrics = Metrics()
+        self.client.post_request_hooks.append(metrics)
+        seen = []
+        self.client.pre_request_hooks.append(lambda event: seen.append((event.method, event.template, event.attempt)))
+
+        self.client.edit_tag("tag_id", "x")
+        self.assertEqual(seen, [("PATCH", "/tags/{id}", 0), ("PATCH", "/tags/{id}", 1)])
+        stats = metrics.to_dict()["PATCH /tags/{id}"]
+        self.assertEqual(stats["count"], 2)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["errors"], {"503": 1})
+        self.assertEqual(stats["request_bytes"], 2 * len(b'{"label": "x"}'))
+        self.assertEqual(stats["response_bytes"], len(b'{"tag": {}}'))
+
+    @patch('requests.Session.request')
+    def test_single_flight(self, mock_request: Any) -> None:
+        client = TimeularClient("fake_api_key", "fake_api_secret", single_flight=True)
+        client.token = "fake_token"
+        release = threading.Event()
+
+        def request(*args: Any, **kwargs: Any) -> requests.Response:
+            release.wait(5)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'{"currentTracking": null}'
+            return response
+
+        mock_request.side_effect = request
+        with ThreadPoolExecutor(6) as executor:
+            futures = [executor.submit(client.get_current_tracking) for _ in range(6)]
+            time.sleep(0.05)
+            release.set()
+            results = [f.result() for f in futures]
+        self.assertEqual(results, [{"currentTracking": None}] * 6)
+        self.assertIsNot(results[0], results[1])
+        self.assertEqual(mock_request.call_count, 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
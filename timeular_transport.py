@@ -0,0 +1,315 @@
+import itertools
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from timeular_json import loads
+
+Reply = Tuple[int, Dict[str, Any]]
+
+_TIMESTAMP = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime(_TIMESTAMP)[:-3]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _not_found() -> Reply:
+    return 404, {"message": "Not Found"}
+
+
+class FakeTimeularAPI:
+    """In-memory stand-in for the v4 API.
+
+    Keeps activities, time entries, tags, mentions and the current tracking,
+    and answers the endpoints TimeularClient uses. With ``credentials`` (API
+    key to secret) sign-in checks them; otherwise any key signs in. Paths are
+    relative to the API root, e.g. ``/time-entries/1``.
+    """
+
+    def __init__(self, credentials: Optional[Mapping[str, str]] = None, clock: Callable[[], datetime] = _utcnow) -> None:
+        self.credentials = credentials
+        self.clock = clock
+        self.activities: Dict[str, Dict[str, Any]] = {}
+        self.time_entries: Dict[str, Dict[str, Any]] = {}
+        self.tags: Dict[str, Dict[str, Any]] = {}
+        self.mentions: Dict[str, Dict[str, Any]] = {}
+        self.current_tracking: Optional[Dict[str, Any]] = None
+        self.tokens: Dict[str, str] = {}
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Callable[[str, Optional[str], Dict[str, Any]], Reply]] = {
+            "activities": self._activities,
+            "time-entries": self._time_entries,
+            "tracking": self._tracking,
+            "reports": self._reports,
+            "tags": self._tags,
+            "mentions": self._mentions,
+        }
+
+    def _next_id(self) -> str:
+        return str(next(self._ids))
+
+    def add_activity(self, name: str, color: str = "#000000") -> Dict[str, Any]:
+        activity = {"id": self._next_id(), "name": name, "color": color, "integration": "zei", "spaceId": "1"}
+        self.activities[activity["id"]] = activity
+        return activity
+
+    def add_time_entry(self, activity_id: str, started_at: str, stopped_at: str, note: Optional[str] = None) -> Dict[str, Any]:
+        entry = {
+            "id": self._next_id(),
+            "activityId": activity_id,
+            "duration": {"startedAt": started_at, "stoppedAt": stopped_at},
+            "note": {"text": note, "tags": [], "mentions": []},
+        }
+        self.time_entries[entry["id"]] = entry
+        return entry
+
+    def handle(self, method: str, path: str, headers: Mapping[str, str], body: Any) -> Reply:
+        with self._lock:
+            self.requests += 1
+            if path == "/developer/sign-in" and method == "POST":
+                return self._sign_in(body or {})
+            auth = headers.get("Authorization", "")
+            if not auth.startswith("Bearer ") or auth[len("Bearer "):] not in self.tokens:
+                return 401, {"message": "Unauthorized"}
+            parts = path.strip("/").split("/")
+            route = self._routes.get(parts[0])
+            if route is None or len(parts) > 2:
+                return _not_found()
+            return route(method, parts[1] if len(parts) == 2 else None, body or {})
+
+    def _sign_in(self, body: Dict[str, Any]) -> Reply:
+        key, secret = body.get("apiKey"), body.get("apiSecret")
+        if self.credentials is not None and self.credentials.get(key) != secret:
+            return 401, {"message": "You provided invalid apiKey/apiSecret pair"}
+        token = f"fake-token-{len(self.tokens) + 1}"
+        self.tokens[token] = key
+        return 200, {"token": token}
+
+    def _activities(self, method: str, item: Optional[str], body: Dict[str, Any]) -> Reply:
+        if item is None:
+            if method == "GET":
+                return 200, {"activities": list(self.activities.values())}
+            if method == "POST":
+                return 200, self.add_activity(body["name"], body["color"])
+        elif item in self.activities:
+            if method == "PATCH":
+                self.activities[item].update(name=body["name"], color=body["color"])
+                return 200, self.activities[item]
+            if method == "DELETE":
+                del self.activities[item]
+                return 200, {}
+        return _not_found()
+
+    def _time_entries(self, method: str, item: Optional[str], body: Dict[str, Any]) -> Reply:
+        if item is None:
+            if method == "GET":
+                return 200, {"timeEntries": list(self.time_entries.values())}
+            if method == "POST":
+                return 200, self.add_time_entry(body["activityId"], body["startedAt"], body["stoppedAt"])
+        elif item in self.time_entries:
+            entry = self.time_entries[item]
+            if method == "GET":
+                return 200, entry
+            if method == "PATCH":
+                entry["duration"] = {"startedAt": body["startedAt"], "stoppedAt": body["stoppedAt"]}
+                return 200, entry
+            if method == "DELETE":
+                del self.time_entries[item]
+                return 200, {}
+        return _not_found()
+
+    def _tracking(self, method: str, item: Optional[str], body: Dict[str, Any]) -> Reply:
+        current = self.current_tracking
+        if item is None:
+            if method == "GET":
+                return 200, {"currentTracking": current}
+            if method == "POST":
+                if current is not None:
+                    return 409, {"message": "Tracking already started"}
+                if body.get("activityId") not in self.activities:
+                    return 400, {"message": "Unknown activity"}
+                self.current_tracking = {
+                    "id": self._next_id(),
+                    "activityId": body["activityId"],
+                    "startedAt": _timestamp(self.clock()),
+                    "note": {"text": None, "tags": [], "mentions": []},
+                }
+                return 200, {"currentTracking": self.current_tracking}
+            if method == "DELETE":
+                if current is None:
+                    return 400, {"message": "No tracking is running"}
+                self.current_tracking = None
+                entry = self.add_time_entry(current["activityId"], current["startedAt"], _timestamp(self.clock()))
+                return 200, {"createdTimeEntry": entry}
+        elif current is not None and item == current["id"]:
+            if method == "PATCH":
+                current["startedAt"] = body.get("startedAt", current["startedAt"])
+                return 200, {"currentTracking": current}
+            if method == "DELETE":
+                self.current_tracking = None
+                return 200, {}
+        return _not_found()
+
+    def _reports(self, method: str, item: Optional[str], body: Dict[str, Any]) -> Reply:
+        if method != "POST" or item != "time-entries":
+            return _not_found()
+        start, end = body["startDate"], body["endDate"]
+        if len(end) == 10:
+            end = _timestamp(datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1) - timedelta(milliseconds=1))
+        entries = [e for e in self.time_entries.values() if start <= e["duration"]["startedAt"] <= end]
+        entries.sort(key=lambda e: e["duration"]["startedAt"])
+        return 200, {"timeEntries": entries}
+
+    def _labels(self, store: Dict[str, Dict[str, Any]], key: str, method: str, item: Optional[str], body: Dict[str, Any]) -> Reply:
+        if item is None:
+            if method == "GET":
+                return 200, {key: list(store.values())}
+            if method == "POST":
+                label_id = self._next_id()
+                store[label_id] = {"id": int(label_id), "key": label_id, "label": body["label"], "scope": "timeular", "spaceId": "1"}
+                return 200, store[label_id]
+        elif item in store:
+            if method == "PATCH":
+                store[item]["label"] = body["label"]
+                return 200, store[item]
+            if method == "DELETE":
+                del store[item]
+                return 200, {}
+        return _not_found()
+
+    def _tags(self, method: str, item: Optional[str], body: Dict[str, Any]) -> Reply:
+        return self._labels(self.tags, "tags", method, item, body)
+
+    def _mentions(self, method: str, item: Optional[str], body: Dict[str, Any]) -> Reply:
+        return self._labels(self.mentions, "mentions", method, item, body)
+
+
+def _call(api: FakeTimeularAPI, root: str, method: str, url: str, headers: Optional[Mapping[str, str]], body: Any) -> Tuple[int, Dict[str, str], bytes]:
+    path = urlsplit(url).path
+    if path.startswith(root):
+        path = path[len(root):]
+    status, payload = api.handle(method.upper(), path, headers or {}, body)
+    content = _dumps(payload)
+    return status, {"Content-Type": "application/json", "Content-Length": str(len(content))}, content
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload).encode()
+
+
+class _FakeRequest:
+    __slots__ = ("method", "url", "headers", "body")
+
+    def __init__(self, method: str, url: str, headers: Mapping[str, str], body: Optional[bytes]) -> None:
+        self.method = method
+        self.url = url
+        self.headers = dict(headers, **{"Content-Length": str(len(body or b""))})
+        self.body = body
+
+
+class FakeResponse:
+    """The parts of ``requests.Response`` the sync client uses."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes, request: _FakeRequest) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.request = request
+        self.url = request.url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        pass
+
+
+class FakeTransport:
+    """Stands in for ``requests.Session``, answering from a FakeTimeularAPI without opening sockets."""
+
+    def __init__(self, api: Optional[FakeTimeularAPI] = None, root: str = "/api/v4") -> None:
+        self.api = api if api is not None else FakeTimeularAPI()
+        self.root = root
+
+    def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None, json: Any = None, **kwargs: Any) -> FakeResponse:
+        body = None if json is None else _dumps(json)
+        status, response_headers, content = _call(self.api, self.root, method, url, headers, json)
+        return FakeResponse(status, response_headers, content, _FakeRequest(method.upper(), url, headers or {}, body))
+
+    def post(self, url: str, **kwargs: Any) -> FakeResponse:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncFakeResponse:
+    """The parts of ``aiohttp.ClientResponse`` the async client uses."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, request_info: _FakeRequest) -> None:
+        self.status = status
+        self.headers = headers
+        self._body = body
+        self.request_info = request_info
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self) -> Any:
+        return loads(self._body)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            import aiohttp
+
+            raise aiohttp.ClientResponseError(
+                self.request_info, (), status=self.status, message=self._body.decode(), headers=self.headers  # type: ignore[arg-type]
+            )
+
+    async def __aenter__(self) -> "AsyncFakeResponse":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        pass
+
+
+class AsyncFakeTransport:
+    """Stands in for ``aiohttp.ClientSession``, answering from a FakeTimeularAPI."""
+
+    def __init__(self, api: Optional[FakeTimeularAPI] = None, root: str = "/api/v4") -> None:
+        self.api = api if api is not None else FakeTimeularAPI()
+        self.root = root
+
+    def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None, json: Any = None, **kwargs: Any) -> AsyncFakeResponse:
+        body = None if json is None else _dumps(json)
+        status, response_headers, content = _call(self.api, self.root, method, url, headers, json)
+        return AsyncFakeResponse(status, response_headers, content, _FakeRequest(method.upper(), url, headers or {}, body))
+
+    def post(self, url: str, **kwargs: Any) -> AsyncFakeResponse:
+        return self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        pass
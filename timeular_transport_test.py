@@ -0,0 +1,95 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import aiohttp
+import requests
+
+from timeular import TimeularClient
+from timeular_async import AsyncTimeularClient
+from timeular_models import Activity, TimeEntry
+from timeular_transport import AsyncFakeTransport, FakeTimeularAPI, FakeTransport
+
+
+class TestFakeTransport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = FakeTimeularAPI(credentials={"key": "secret"}, clock=lambda: datetime(2023, 1, 2, 9))
+        self.client = TimeularClient("key", "secret", session=FakeTransport(self.api))
+
+    def test_activities_and_labels(self) -> None:
+        activity = self.client.create_activity("Work", "#ffffff")
+        self.client.edit_activity(activity["id"], "Deep work", "#000000")
+        self.assertEqual([a["name"] for a in self.client.get_activities()["activities"]], ["Deep work"])
+        self.client.archive_activity(activity["id"])
+        self.assertEqual(self.client.get_activities(), {"activities": []})
+
+        tag = self.client.create_tag("billable")
+        self.client.edit_tag(str(tag["id"]), "billed")
+        self.client.create_mention("alice")
+        self.assertEqual([t["label"] for t in self.client.get_tags()["tags"]], ["billed"])
+        self.assertEqual(len(self.client.get_mentions()["mentions"]), 1)
+        self.client.delete_tag(str(tag["id"]))
+        self.assertEqual(self.client.get_tags(), {"tags": []})
+
+    def test_tracking_creates_time_entry(self) -> None:
+        activity = self.client.create_activity("Work", "#ffffff")
+        self.assertIsNone(self.client.get_current_tracking()["currentTracking"])
+        tracking = self.client.start_tracking(activity["id"])["currentTracking"]
+        self.assertEqual(tracking["startedAt"], "2023-01-02T09:00:00.000")
+        with self.assertRaises(requests.HTTPError) as ctx:
+            self.client.start_tracking(activity["id"])
+        self.assertEqual(ctx.exception.response.status_code, 409)
+        self.api.clock = lambda: datetime(2023, 1, 2, 10)
+        entry = self.client.stop_current_activity()["createdTimeEntry"]
+        self.assertEqual(entry["duration"], {"startedAt": "2023-01-02T09:00:00.000", "stoppedAt": "2023-01-02T10:00:00.000"})
+        self.assertEqual(self.client.find_time_entry(entry["id"]), entry)
+
+    def test_time_entries_and_reports(self) -> None:
+        activity = self.client.create_activity("Work", "#ffffff")
+        first = self.client.create_time_entry(activity["id"], "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+        self.client.create_time_entry(activity["id"], "2023-02-01T09:00:00.000", "2023-02-01T10:00:00.000")
+        self.client.edit_time_entry(first["id"], "2023-01-01T08:00:00.000", "2023-01-01T10:00:00.000")
+        report = self.client.generate_report("2023-01-01", "2023-01-31")
+        self.assertEqual([e["duration"]["startedAt"] for e in report["timeEntries"]], ["2023-01-01T08:00:00.000"])
+        self.assertEqual(len(list(self.client.stream_report("2023-01-01", "2023-12-31"))), 2)
+        entries = list(self.client.iter_time_entries("2023-01-01", "2023-12-31", window=timedelta(days=7)))
+        self.assertEqual([e.duration_seconds for e in entries], [7200.0, 3600.0])
+        self.client.delete_time_entry(first["id"])
+        with self.assertRaises(requests.HTTPError):
+            self.client.find_time_entry(first["id"])
+
+    def test_models_and_sign_in(self) -> None:
+        client = TimeularClient("key", "secret", session=FakeTransport(self.api), models=True)
+        client.create_activity("Work", "#ffffff")
+        self.assertIsInstance(client.get_activities()["activities"][0], Activity)
+        self.assertEqual(len(self.api.tokens), 1)
+        with self.assertRaises(requests.HTTPError):
+            TimeularClient("key", "wrong", session=FakeTransport(self.api)).get_activities()
+
+    def test_unknown_token_is_refreshed(self) -> None:
+        self.client.token = "expired"
+        self.assertEqual(self.client.get_time_entries(), {"timeEntries": []})
+        self.assertNotEqual(self.client.token, "expired")
+
+
+class TestAsyncFakeTransport(unittest.IsolatedAsyncioTestCase):
+
+    async def test_round_trip(self) -> None:
+        api = FakeTimeularAPI()
+        async with AsyncTimeularClient("key", "secret", session=AsyncFakeTransport(api), models=True) as client:
+            activity = await client.create_activity("Work", "#ffffff")
+            await client.create_time_entry(activity["id"], "2023-01-01T09:00:00.000", "2023-01-01T10:00:00.000")
+            entries = [e async for e in client.iter_time_entries("2023-01-01", "2023-01-31")]
+            self.assertEqual([type(e) for e in entries], [TimeEntry])
+            with self.assertRaises(aiohttp.ClientResponseError) as ctx:
+                await client.find_time_entry("missing")
+            self.assertEqual(ctx.exception.status, 404)
+        self.assertEqual(len(api.tokens), 1)
+
+    async def test_session_and_connector_conflict(self) -> None:
+        with self.assertRaises(ValueError):
+            AsyncTimeularClient("key", "secret", session=AsyncFakeTransport(), connector=MagicMock())
+
+if __name__ == '__main__':
+    unittest.main()